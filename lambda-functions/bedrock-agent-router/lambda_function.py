@@ -6,46 +6,24 @@ Routes Bedrock Agent action group requests to appropriate handlers
 import json
 import boto3
 import os
-from datetime import datetime
+from botocore.exceptions import ClientError
+
+# Provided by the common layer (lambda-functions/common-layer)
+from s3_stream import read_text
+from reference_data import get_dataset, data_source
+from summary_ids import summary_idempotency_key, summary_id_for
+
+from response_envelope import build_response
 
 s3_client = boto3.client('s3')
 BUCKET_NAME = os.environ.get('S3_BUCKET_NAME', 'onboarding-copilot-docs')
+# Docs larger than this are truncated instead of being read into memory whole
+DOC_MAX_BYTES = int(os.environ.get('DOC_MAX_BYTES', str(1024 * 1024)))
 
 def get_tickets():
-    """Get available Jira tickets"""
-    try:
-        print(f"Attempting to fetch tickets from S3: s3://{BUCKET_NAME}/docs/sample_jira_tickets.json")
-        response = s3_client.get_object(
-            Bucket=BUCKET_NAME,
-            Key='docs/sample_jira_tickets.json'
-        )
-        tickets = json.loads(response['Body'].read().decode('utf-8'))
-        print(f"Successfully fetched {len(tickets)} tickets from S3")
-    except Exception as e:
-        print(f"Failed to fetch from S3: {str(e)}. Using fallback data.")
-        tickets = [
-            {
-                "id": "BE-101",
-                "title": "Set up local development environment",
-                "description": "Install Node.js, Docker, and configure AWS CLI",
-                "priority": "High",
-                "estimatedHours": 4
-            },
-            {
-                "id": "BE-102",
-                "title": "Understand API Gateway architecture",
-                "description": "Review API Gateway setup and routing logic",
-                "priority": "High",
-                "estimatedHours": 6
-            },
-            {
-                "id": "BE-103",
-                "title": "Set up DynamoDB local",
-                "description": "Configure local DynamoDB for development",
-                "priority": "Medium",
-                "estimatedHours": 3
-            }
-        ]
+    """Get available Jira tickets (layer snapshot, S3 override if present)"""
+    tickets = get_dataset('tickets', s3_client, BUCKET_NAME)
+    print(f"Serving {len(tickets)} tickets from {data_source('tickets')}")
     
     return {
         "success": True,
@@ -61,13 +39,14 @@ def get_docs(doc_name="architecture_overview.md"):
             Bucket=BUCKET_NAME,
             Key=f'docs/{doc_name}'
         )
-        content = response['Body'].read().decode('utf-8')
-        print(f"Successfully fetched document: {doc_name} ({len(content)} bytes)")
+        content, truncated = read_text(response['Body'], max_bytes=DOC_MAX_BYTES)
+        print(f"Successfully fetched document: {doc_name} ({len(content)} chars, truncated={truncated})")
         
         return {
             "success": True,
             "content": content,
             "doc_name": doc_name,
+            "truncated": truncated,
             "source": f"s3://{BUCKET_NAME}/docs/{doc_name}"
         }
     except Exception as e:
@@ -79,25 +58,9 @@ def get_docs(doc_name="architecture_overview.md"):
         }
 
 def get_glossary():
-    """Get team glossary"""
-    try:
-        print(f"Attempting to fetch glossary from S3: s3://{BUCKET_NAME}/docs/team_glossary.json")
-        response = s3_client.get_object(
-            Bucket=BUCKET_NAME,
-            Key='docs/team_glossary.json'
-        )
-        glossary = json.loads(response['Body'].read().decode('utf-8'))
-        print(f"Successfully fetched glossary with {len(glossary)} terms from S3")
-    except Exception as e:
-        print(f"Failed to fetch glossary from S3: {str(e)}. Using fallback data.")
-        glossary = {
-            "API Gateway": "AWS service that handles HTTP requests and routes them to backend services",
-            "Lambda": "Serverless compute service that runs code without managing servers",
-            "DynamoDB": "NoSQL database service provided by AWS",
-            "S3": "Simple Storage Service - object storage in the cloud",
-            "Cognito": "AWS service for user authentication and authorization",
-            "JWT": "JSON Web Token - a secure way to transmit information between parties"
-        }
+    """Get team glossary (layer snapshot, S3 override if present)"""
+    glossary = get_dataset('glossary', s3_client, BUCKET_NAME)
+    print(f"Serving glossary with {len(glossary)} terms from {data_source('glossary')}")
     
     return {
         "success": True,
@@ -105,25 +68,34 @@ def get_glossary():
         "term_count": len(glossary)
     }
 
-def write_summary(summary, user_id="new_joiner"):
-    """Save standup summary to S3"""
+def write_summary(summary, user_id="new_joiner", idempotency_key=None):
+    """Save standup summary to S3 (idempotent - retries don't create duplicates)"""
     try:
-        timestamp = datetime.now().isoformat()
-        summary_id = f"{user_id}_{timestamp}"
+        key_source = idempotency_key or summary_idempotency_key(summary, user_id)
+        summary_id = summary_id_for(key_source, user_id)
         key = f"summaries/{summary_id}.json"
         
         print(f"Attempting to write summary to S3: s3://{BUCKET_NAME}/{key}")
-        s3_client.put_object(
-            Bucket=BUCKET_NAME,
-            Key=key,
-            Body=json.dumps(summary, indent=2),
-            ContentType='application/json'
-        )
-        print(f"Successfully wrote summary to S3")
+        try:
+            s3_client.put_object(
+                Bucket=BUCKET_NAME,
+                Key=key,
+                Body=json.dumps(summary, indent=2),
+                ContentType='application/json',
+                IfNoneMatch='*'
+            )
+            duplicate = False
+            print(f"Successfully wrote summary to S3")
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') not in ('PreconditionFailed', 'ConditionalRequestConflict'):
+                raise
+            duplicate = True
+            print(f"Summary {summary_id} already exists, skipping duplicate write")
         
         return {
             "success": True,
             "summary_id": summary_id,
+            "duplicate": duplicate,
             "saved_s3": True,
             "location": f"s3://{BUCKET_NAME}/{key}"
         }
@@ -147,8 +119,6 @@ def lambda_handler(event, context):
         api_path = event.get('apiPath', '')
         action_group = event.get('actionGroup', '')
         function_name = event.get('function', '')  # For function schema
-        http_method = event.get('httpMethod', 'POST')
-        message_version = event.get('messageVersion', '1.0')
         
         # Get parameters - function schema uses 'parameters' directly
         request_body = {}
@@ -187,8 +157,9 @@ def lambda_handler(event, context):
         elif function_name == 'writeSummary' or api_path == '/write-summary':
             summary = request_body.get('summary', {})
             user_id = request_body.get('user_id', 'new_joiner')
+            idempotency_key = request_body.get('idempotency_key') or None
             print(f"Calling write_summary(user_id={user_id})")
-            result = write_summary(summary, user_id)
+            result = write_summary(summary, user_id, idempotency_key)
         else:
             print(f"Unknown operation - function: {function_name}, apiPath: {api_path}")
             result = {
@@ -196,44 +167,8 @@ def lambda_handler(event, context):
                 "error": f"Unknown operation. function={function_name}, apiPath={api_path}"
             }
         
-        print(f"Handler result: {json.dumps(result)}")
-        
-        # Format response for Bedrock Agent
-        # For function schema, we don't include apiPath
-        if function_name:
-            # Function schema response format
-            response = {
-                'messageVersion': message_version,
-                'response': {
-                    'actionGroup': action_group,
-                    'function': function_name,
-                    'functionResponse': {
-                        'responseBody': {
-                            'TEXT': {
-                                'body': json.dumps(result)
-                            }
-                        }
-                    }
-                }
-            }
-        else:
-            # API schema response format
-            response = {
-                'messageVersion': message_version,
-                'response': {
-                    'actionGroup': action_group,
-                    'apiPath': api_path,
-                    'httpMethod': http_method,
-                    'httpStatusCode': 200,
-                    'responseBody': {
-                        'application/json': {
-                            'body': json.dumps(result)
-                        }
-                    }
-                }
-            }
-        
-        print(f"Returning response: {json.dumps(response)}")
+        response, body = build_response(event, result)
+        print(f"Handler result ({len(body)} bytes): {body[:1000]}")
         return response
         
     except Exception as e:
@@ -241,44 +176,8 @@ def lambda_handler(event, context):
         import traceback
         traceback.print_exc()
         
-        # Check if using function schema or API schema
-        function_name = event.get('function', '')
-        
-        if function_name:
-            # Function schema error response
-            return {
-                'messageVersion': event.get('messageVersion', '1.0'),
-                'response': {
-                    'actionGroup': event.get('actionGroup', ''),
-                    'function': function_name,
-                    'functionResponse': {
-                        'responseBody': {
-                            'TEXT': {
-                                'body': json.dumps({
-                                    "success": False,
-                                    "error": str(e)
-                                })
-                            }
-                        }
-                    }
-                }
-            }
-        else:
-            # API schema error response
-            return {
-                'messageVersion': event.get('messageVersion', '1.0'),
-                'response': {
-                    'actionGroup': event.get('actionGroup', ''),
-                    'apiPath': event.get('apiPath', ''),
-                    'httpMethod': event.get('httpMethod', 'POST'),
-                    'httpStatusCode': 500,
-                    'responseBody': {
-                        'application/json': {
-                            'body': json.dumps({
-                                "success": False,
-                                "error": str(e)
-                            })
-                        }
-                    }
-                }
-            }
+        response, _ = build_response(event, {
+            "success": False,
+            "error": str(e)
+        }, status=500)
+        return response
@@ -0,0 +1,153 @@
+"""
+Response envelopes for Bedrock Agent action group invocations.
+
+The handler used to build the function-schema / API-schema response dicts
+by hand and call json.dumps(result) up to three times per invocation
+(the log line, the response body, and the response log). Here the result
+is serialized exactly once, and the schema-specific envelope is filled in
+from a template bound per schema. The body also has to fit the agent's
+Lambda response size limit, so oversized results are trimmed and annotated
+with truncation metadata rather than rejected by the agent.
+"""
+
+import json
+import os
+
+# Bedrock Agents reject Lambda responses above 25 KB; keep headroom for the
+# envelope itself
+MAX_BODY_BYTES = int(os.environ.get('AGENT_RESPONSE_MAX_BYTES', str(24 * 1024)))
+
+# ASCII-only output means len(body) is its size in bytes - no encode() copy
+# is needed to enforce the limit
+_encode = json.JSONEncoder(ensure_ascii=True, separators=(',', ':'), default=str).encode
+
+
+def _function_envelope(message_version, action_group, function, api_path, http_method, status, body):
+    return {
+        'messageVersion': message_version,
+        'response': {
+            'actionGroup': action_group,
+            'function': function,
+            'functionResponse': {
+                'responseBody': {
+                    'TEXT': {
+                        'body': body
+                    }
+                }
+            }
+        }
+    }
+
+
+def _api_envelope(message_version, action_group, function, api_path, http_method, status, body):
+    return {
+        'messageVersion': message_version,
+        'response': {
+            'actionGroup': action_group,
+            'apiPath': api_path,
+            'httpMethod': http_method,
+            'httpStatusCode': status,
+            'responseBody': {
+                'application/json': {
+                    'body': body
+                }
+            }
+        }
+    }
+
+
+def _largest_field(result):
+    """Name of the biggest non-empty str/list/dict value in a result dict, if any."""
+    best, best_size = None, 0
+    for key, value in result.items():
+        if key == 'truncation' or not value:
+            continue    # our own metadata, or nothing left to cut
+        if isinstance(value, str):
+            size = len(value)
+        elif isinstance(value, (list, dict)):
+            size = len(_encode(value))
+        else:
+            continue
+        if size > best_size:
+            best, best_size = key, size
+    return best
+
+
+def _shrink(value, overflow):
+    """``value`` with roughly ``overflow`` encoded bytes (or half its items) removed."""
+    if isinstance(value, str):
+        # Escapes make the JSON form longer than the str, so cut in
+        # proportion to the encoded length
+        encoded = len(_encode(value))
+        return value[:max(0, len(value) * (encoded - overflow) // encoded)]
+    if isinstance(value, dict):
+        # e.g. the glossary: keep the first half of the entries
+        return dict(list(value.items())[:len(value) // 2])
+    return value[:len(value) // 2]
+
+
+def serialize_result(result, max_bytes=MAX_BODY_BYTES):
+    """
+    Serialize a handler result to the response body string.
+
+    Oversized results are trimmed field by field (the longest string is cut,
+    the largest list or dict loses items from the end) and get a
+    ``truncation`` entry describing what was removed. If that can't bring
+    the body under ``max_bytes``, an error body is returned instead.
+    """
+    body = _encode(result)
+    if len(body) <= max_bytes or not isinstance(result, dict):
+        return body
+
+    original_bytes = len(body)
+    fields = []
+    trimmed = dict(result)
+    trimmed['truncated'] = True
+    trimmed['truncation'] = {
+        "fields": fields,
+        "original_bytes": original_bytes,
+        "max_bytes": max_bytes
+    }
+    body = _encode(trimmed)
+    while len(body) > max_bytes:
+        field = _largest_field(trimmed)
+        if field is None:
+            break
+        trimmed[field] = _shrink(trimmed[field], len(body) - max_bytes + 256)   # room for the metadata
+        if field not in fields:
+            fields.append(field)
+        previous, body = len(body), _encode(trimmed)
+        if len(body) >= previous:
+            break   # nothing left that shrinks the body
+
+    if len(body) > max_bytes:
+        body = _encode({
+            "success": result.get('success', False),
+            "truncated": True,
+            "error": "Response too large for Bedrock Agent",
+            "truncation": {"original_bytes": original_bytes, "max_bytes": max_bytes}
+        })
+    return body
+
+
+def build_response(event, result, status=200):
+    """
+    Wrap a handler result in the envelope matching the event's schema.
+
+    Returns:
+        Tuple of (response dict, serialized body) - the body is returned so
+        callers can log it without serializing the result again
+    """
+    body = serialize_result(result)
+    function_name = event.get('function', '')
+    envelope = _function_envelope if function_name else _api_envelope
+    response = envelope(
+        event.get('messageVersion', '1.0'),
+        event.get('actionGroup', ''),
+        function_name,
+        event.get('apiPath', ''),
+        event.get('httpMethod', 'POST'),
+        status,
+        body
+    )
+    return response, body
@@ -0,0 +1,78 @@
+"""
+Microbenchmark: router response construction, legacy vs response_envelope.
+
+The legacy path is the pre-envelope handler tail: json.dumps(result) for
+the log line, json.dumps(result) again for the body, then
+json.dumps(response) for the response log.
+
+Usage:
+    python lambda-functions/benchmarks/bench_response_envelope.py
+"""
+
+import json
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'bedrock-agent-router'))
+from response_envelope import build_response  # noqa: E402
+
+DATA_DIR = Path(__file__).resolve().parent.parent.parent / 'data'
+
+EVENT = {'messageVersion': '1.0', 'actionGroup': 'OnboardingTools', 'function': 'getTickets'}
+
+
+def legacy_response(event, result):
+    log_line = f"Handler result: {json.dumps(result)}"
+    response = {
+        'messageVersion': event.get('messageVersion', '1.0'),
+        'response': {
+            'actionGroup': event.get('actionGroup', ''),
+            'function': event.get('function', ''),
+            'functionResponse': {
+                'responseBody': {
+                    'TEXT': {
+                        'body': json.dumps(result)
+                    }
+                }
+            }
+        }
+    }
+    response_log = f"Returning response: {json.dumps(response)}"
+    return response, log_line, response_log
+
+
+def envelope_response(event, result):
+    response, body = build_response(event, result)
+    log_line = f"Handler result ({len(body)} bytes): {body[:1000]}"
+    return response, log_line
+
+
+def _allocated(fn, *args):
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    with open(DATA_DIR / 'sample_jira_tickets.json', 'r', encoding='utf-8') as f:
+        tickets = json.load(f)
+    results = {
+        "tickets (6)": {"success": True, "tickets": tickets, "count": len(tickets)},
+        "tickets (60)": {"success": True, "tickets": tickets * 10, "count": len(tickets) * 10},
+    }
+
+    print(f"{'payload':<16}{'legacy us':>12}{'envelope us':>14}{'legacy KB':>12}{'envelope KB':>14}")
+    for name, result in results.items():
+        legacy = min(timeit.repeat(lambda: legacy_response(EVENT, result), number=2000, repeat=5)) / 2000
+        envelope = min(timeit.repeat(lambda: envelope_response(EVENT, result), number=2000, repeat=5)) / 2000
+        legacy_kb = _allocated(legacy_response, EVENT, result) / 1024
+        envelope_kb = _allocated(envelope_response, EVENT, result) / 1024
+        print(f"{name:<16}{legacy * 1e6:>12.1f}{envelope * 1e6:>14.1f}{legacy_kb:>12.1f}{envelope_kb:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark: peak memory of whole-object vs streaming S3 reads.
+
+Generates a large ticket export on disk and reads it through a
+file-backed botocore StreamingBody (what get_object returns), once per
+strategy, each in a fresh subprocess so peak RSS is not shared.
+
+``read_text_loads`` is the production call pattern for datasets (the
+reference_data overrides), ``read_text_capped`` the one for docs.
+
+Usage:
+    python lambda-functions/benchmarks/bench_s3_streaming.py [--tickets 200000]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+LAYER_DIR = Path(__file__).resolve().parent.parent / 'common-layer' / 'python'
+
+STRATEGIES = ['read_decode_loads', 'read_text_loads', 'read_decode_text', 'read_text_capped']
+
+
+def _make_export(path: Path, count: int):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[')
+        for i in range(count):
+            if i:
+                f.write(',')
+            json.dump({
+                "id": f"BE-{i}",
+                "title": f"Ticket {i}: investigate flaky deploy step",
+                "description": "Deploy pipeline intermittently fails on the integration stage. " * 4,
+                "priority": "Medium",
+                "estimatedHours": i % 8
+            }, f)
+        f.write(']')
+
+
+def _run(strategy: str, path: str):
+    """Child process: run one strategy and print its measurements as JSON."""
+    sys.path.insert(0, str(LAYER_DIR))
+    from botocore.response import StreamingBody
+    from s3_stream import read_text
+
+    body = StreamingBody(open(path, 'rb'), os.path.getsize(path))
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    started = time.perf_counter()
+
+    if strategy == 'read_decode_loads':
+        items = len(json.loads(body.read().decode('utf-8')))
+    elif strategy == 'read_text_loads':
+        items = len(json.loads(read_text(body)[0]))
+    elif strategy == 'read_decode_text':
+        items = len(body.read().decode('utf-8'))
+    else:
+        items = len(read_text(body, max_bytes=1024 * 1024)[0])
+
+    elapsed = time.perf_counter() - started
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({
+        "strategy": strategy,
+        "items": items,
+        "seconds": round(elapsed, 3),
+        "python_peak_mb": round(traced_peak / 2 ** 20, 1),
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_growth_mb": round((rss_after - rss_before) / 1024, 1)
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tickets', type=int, default=200000)
+    parser.add_argument('--child', nargs=2, metavar=('STRATEGY', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _run(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'tickets.json'
+        _make_export(path, args.tickets)
+        size_mb = path.stat().st_size / 2 ** 20
+        print(f"Export: {args.tickets} tickets, {size_mb:.1f} MB\n")
+        print(f"{'strategy':<22}{'seconds':>10}{'py peak MB':>12}{'RSS +MB':>10}")
+        for strategy in STRATEGIES:
+            out = subprocess.run(
+                [sys.executable, __file__, '--child', strategy, str(path)],
+                capture_output=True, text=True, check=True
+            ).stdout
+            r = json.loads(out)
+            print(f"{r['strategy']:<22}{r['seconds']:>10}{r['python_peak_mb']:>12}{r['peak_rss_growth_mb']:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Build the reference-data snapshot shipped in the common Lambda layer.
+
+Compiles the JSON files under data/ into one pickled snapshot
+(python/reference_snapshot.pickle) that reference_data.py loads at Lambda
+init. Run this before zipping the layer so the packaged data always matches
+the repo's data files.
+
+Usage:
+    python lambda-functions/common-layer/build_reference_snapshot.py [--data-dir data] [--output PATH]
+"""
+
+import argparse
+import hashlib
+import json
+import pickle
+from datetime import datetime, timezone
+from pathlib import Path
+
+LAYER_DIR = Path(__file__).resolve().parent
+REPO_DATA_DIR = LAYER_DIR.parent.parent / 'data'
+DEFAULT_OUTPUT = LAYER_DIR / 'python' / 'reference_snapshot.pickle'
+
+# Dataset name -> source file (keep in sync with reference_data.SOURCES)
+SOURCES = {
+    'tickets': 'sample_jira_tickets.json',
+    'glossary': 'team_glossary.json',
+    'compliance': 'compliance_requirements.json',
+    'videos': 'tutorial_videos.json'
+}
+
+SNAPSHOT_FORMAT = 2
+
+
+def build_snapshot(data_dir: Path) -> dict:
+    """
+    Load every source file. Each dataset also records the ETag S3 gives the
+    same file when it is uploaded in one part (the quoted MD5 of its bytes),
+    so an identical S3 override is answered with 304 Not Modified.
+    """
+    digest = hashlib.sha256()
+    datasets = {}
+    etags = {}
+    for name, filename in SOURCES.items():
+        raw = (data_dir / filename).read_bytes()
+        digest.update(filename.encode('utf-8') + b'\0' + raw)
+        datasets[name] = json.loads(raw)
+        etags[name] = f'"{hashlib.md5(raw).hexdigest()}"'
+
+    return {
+        "format": SNAPSHOT_FORMAT,
+        "version": digest.hexdigest()[:16],
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "sources": SOURCES,
+        "datasets": datasets,
+        "etags": etags
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the reference-data layer snapshot")
+    parser.add_argument('--data-dir', type=Path, default=REPO_DATA_DIR)
+    parser.add_argument('--output', type=Path, default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    snapshot = build_snapshot(args.data_dir)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = args.output.with_suffix('.tmp')
+    with open(tmp, 'wb') as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp.replace(args.output)
+
+    print(f"Wrote {args.output} (version {snapshot['version']}, {args.output.stat().st_size} bytes)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+Reference data for the Lambda functions (common layer).
+
+The snapshot built by build_reference_snapshot.py is loaded once, at Lambda
+init, so the common path never waits on S3. S3 is only used as an
+override. At most every REFERENCE_OVERRIDE_CHECK_SECONDS per dataset, a
+conditional GET (If-None-Match on the last ETag) checks
+``s3://<bucket>/docs/<file>``:
+- 304 keeps the current data.
+- 200 replaces it.
+- 404 drops the override and falls back to the snapshot.
+
+Datasets in the snapshot count as checked at init, so a cold container
+serves the snapshot straight away. Their first check sends the snapshot's
+own ETag, so an override identical to the packaged file (the documented
+deploy uploads the same files) costs a 304 and no download.
+"""
+
+import json
+import os
+import pickle
+import time
+from pathlib import Path
+
+from s3_stream import read_text
+
+SNAPSHOT_PATH = Path(os.environ.get(
+    'REFERENCE_SNAPSHOT_PATH', str(Path(__file__).resolve().parent / 'reference_snapshot.pickle')
+))
+OVERRIDE_CHECK_SECONDS = float(os.environ.get('REFERENCE_OVERRIDE_CHECK_SECONDS', '300'))
+
+# Dataset name -> file under docs/ in S3 (keep in sync with the build script)
+SOURCES = {
+    'tickets': 'sample_jira_tickets.json',
+    'glossary': 'team_glossary.json',
+    'compliance': 'compliance_requirements.json',
+    'videos': 'tutorial_videos.json'
+}
+
+
+def _load_snapshot():
+    try:
+        with open(SNAPSHOT_PATH, 'rb') as f:
+            snapshot = pickle.load(f)
+        print(f"Loaded reference snapshot {snapshot['version']} from {SNAPSHOT_PATH}")
+        return snapshot
+    except FileNotFoundError:
+        # Layer built without a snapshot - S3 becomes the only source
+        print(f"Reference snapshot missing at {SNAPSHOT_PATH}; run build_reference_snapshot.py")
+        return {"version": None, "datasets": {}, "etags": {}}
+
+
+# Loaded at import time, i.e. during Lambda init
+_snapshot = _load_snapshot()
+_overrides = {}          # dataset -> (etag, data)
+# dataset -> time.monotonic() of last S3 check; the snapshot counts as one
+_last_checked = {name: time.monotonic() for name in _snapshot['datasets']}
+
+
+def _check_override(name, s3_client, bucket):
+    key = f"docs/{SOURCES[name]}"
+    request = {'Bucket': bucket, 'Key': key}
+    etag = _overrides[name][0] if name in _overrides else _snapshot.get('etags', {}).get(name)
+    if etag:
+        request['IfNoneMatch'] = etag
+
+    try:
+        response = s3_client.get_object(**request)
+    except Exception as e:
+        code = getattr(e, 'response', {}).get('Error', {}).get('Code', '')
+        if code in ('304', 'NotModified'):
+            return
+        if code in ('NoSuchKey', '404'):
+            _overrides.pop(name, None)
+            return
+        # Transient errors keep whatever we already have
+        print(f"Reference override check failed for {key}: {str(e)}")
+        return
+
+    # Every dataset is kept whole, so the streamed text is parsed in one go
+    # (see bench_s3_streaming.py: item-by-item parsing only saves memory when
+    # items are not kept)
+    data = json.loads(read_text(response['Body'])[0])
+    _overrides[name] = (response.get('ETag', ''), data)
+    print(f"Using S3 override for {name} ({key}, ETag {response.get('ETag')})")
+
+
+def get_dataset(name, s3_client=None, bucket=None):
+    """
+    Return a reference dataset ('tickets', 'glossary', 'compliance', 'videos').
+
+    Args:
+        name: Dataset name
+        s3_client: Client used for the periodic override check (optional)
+        bucket: Bucket holding the docs/ overrides
+
+    Raises:
+        KeyError: If the dataset is in neither the snapshot nor S3
+    """
+    if s3_client is not None and bucket:
+        now = time.monotonic()
+        if now - _last_checked.get(name, float('-inf')) >= OVERRIDE_CHECK_SECONDS:
+            _last_checked[name] = now
+            _check_override(name, s3_client, bucket)
+
+    if name in _overrides:
+        return _overrides[name][1]
+    return _snapshot['datasets'][name]
+
+
+def data_source(name):
+    """'s3-override' or 'snapshot:<version>' - where get_dataset() data comes from."""
+    if name in _overrides:
+        return 's3-override'
+    return f"snapshot:{_snapshot['version']}"
+
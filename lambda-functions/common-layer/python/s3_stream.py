@@ -0,0 +1,45 @@
+"""
+Streaming S3 readers shared by the Lambda functions (common layer).
+
+``response['Body'].read().decode('utf-8')`` holds the whole object as bytes
+and then copies it into a str. read_text() reads the body in chunks with an
+incremental UTF-8 decoder instead, and caps the number of bytes read so a
+huge doc can't OOM the function. It reports whether the text was truncated.
+"""
+
+import codecs
+
+CHUNK_SIZE = 64 * 1024
+
+
+def read_text(body, max_bytes=None, chunk_size=CHUNK_SIZE):
+    """
+    Read a StreamingBody as text.
+
+    Args:
+        body: botocore StreamingBody (anything with iter_chunks/close)
+        max_bytes: Stop after this many bytes (None = no limit)
+        chunk_size: Bytes per read
+
+    Returns:
+        Tuple of (text, truncated)
+    """
+    text_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    parts = []
+    total = 0
+    truncated = False
+    try:
+        for chunk in body.iter_chunks(chunk_size):
+            if max_bytes is not None and total + len(chunk) > max_bytes:
+                chunk = chunk[:max_bytes - total]
+                truncated = True
+            total += len(chunk)
+            parts.append(text_decoder.decode(chunk))
+            if truncated:
+                break
+        # A multi-byte character cut off by truncation is dropped, not replaced
+        parts.append(text_decoder.decode(b'', final=not truncated))
+    finally:
+        body.close()
+    return ''.join(parts), truncated
+
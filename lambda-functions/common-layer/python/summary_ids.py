@@ -0,0 +1,28 @@
+"""
+Summary ID scheme shared by the Lambda functions (common layer).
+
+IDs look like ``<user>_<hash>``. The user part is sanitized for use in an
+S3 key, so different user IDs can share a prefix ("a/b" and "a_b"). The
+hash therefore covers the raw user ID together with the idempotency key:
+two users sending the same key never map to each other's summary.
+
+The MCP server (mcp-server/server.py) and the write_summary Lambda keep
+copies of these two functions; change all three together.
+"""
+
+import hashlib
+import json
+import re
+
+
+def summary_idempotency_key(summary, user_id):
+    """Content hash used as the idempotency key when the caller gives none"""
+    canonical = json.dumps({"user_id": user_id, "summary": summary}, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def summary_id_for(key, user_id):
+    """Summary ID for an idempotency key, scoped by user"""
+    safe_user = re.sub(r'[^A-Za-z0-9._-]', '_', str(user_id))
+    digest = hashlib.sha256(json.dumps([str(user_id), key]).encode('utf-8')).hexdigest()
+    return f"{safe_user}_{digest[:20]}"
@@ -7,8 +7,13 @@ import json
 import boto3
 import os
 
+# Provided by the common layer (lambda-functions/common-layer)
+from s3_stream import read_text
+
 s3_client = boto3.client('s3')
 BUCKET_NAME = os.environ.get('S3_BUCKET_NAME', 'onboarding-copilot-docs')
+# Docs larger than this are truncated instead of being read into memory whole
+DOC_MAX_BYTES = int(os.environ.get('DOC_MAX_BYTES', str(1024 * 1024)))
 
 def lambda_handler(event, context):
     """
@@ -33,7 +38,7 @@ def lambda_handler(event, context):
             Bucket=BUCKET_NAME,
             Key=f'docs/{doc_name}'
         )
-        content = response['Body'].read().decode('utf-8')
+        content, truncated = read_text(response['Body'], max_bytes=DOC_MAX_BYTES)
         
         # Format response for Bedrock Agent
         response_body = {
@@ -42,6 +47,7 @@ def lambda_handler(event, context):
                     "success": True,
                     "content": content,
                     "doc_name": doc_name,
+                    "truncated": truncated,
                     "source": "S3"
                 })
             }
@@ -4,6 +4,14 @@ Bedrock Agent Action - Get team glossary
 """
 
 import json
+import boto3
+import os
+
+# Provided by the common layer (lambda-functions/common-layer)
+from reference_data import get_dataset
+
+s3_client = boto3.client('s3')
+BUCKET_NAME = os.environ.get('S3_BUCKET_NAME', 'onboarding-copilot-docs')
 
 def lambda_handler(event, context):
     """
@@ -12,20 +20,8 @@ def lambda_handler(event, context):
     print(f"Event: {json.dumps(event)}")
     
     try:
-        glossary = {
-            "API Gateway": "AWS service that handles HTTP requests and routes them to backend services",
-            "Lambda": "Serverless compute service that runs code without managing servers",
-            "DynamoDB": "NoSQL database service provided by AWS",
-            "S3": "Simple Storage Service - object storage for files and data",
-            "Bedrock": "AWS service for accessing foundation models (LLMs)",
-            "MCP": "Model Context Protocol - standard for AI tool integration",
-            "SOC2": "Security compliance framework for service organizations",
-            "Standup": "Daily team meeting to share progress and blockers",
-            "Sprint": "Time-boxed period (usually 2 weeks) for completing work",
-            "PR": "Pull Request - code review process before merging changes",
-            "CI/CD": "Continuous Integration/Continuous Deployment - automated testing and deployment",
-            "IAM": "Identity and Access Management - AWS service for permissions"
-        }
+        # Packaged snapshot from the common layer; S3 is only an override
+        glossary = get_dataset('glossary', s3_client, BUCKET_NAME)
         
         response_body = {
             "application/json": {
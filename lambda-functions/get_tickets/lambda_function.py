@@ -7,6 +7,9 @@ import json
 import boto3
 import os
 
+# Provided by the common layer (lambda-functions/common-layer)
+from reference_data import get_dataset
+
 s3_client = boto3.client('s3')
 BUCKET_NAME = os.environ.get('S3_BUCKET_NAME', 'onboarding-copilot-docs')
 
@@ -19,38 +22,8 @@ def lambda_handler(event, context):
     print(f"Event: {json.dumps(event)}")
     
     try:
-        # Try to get from S3 first
-        try:
-            response = s3_client.get_object(
-                Bucket=BUCKET_NAME,
-                Key='docs/sample_jira_tickets.json'
-            )
-            tickets = json.loads(response['Body'].read().decode('utf-8'))
-        except:
-            # Fallback to hardcoded tickets
-            tickets = [
-                {
-                    "id": "BE-101",
-                    "title": "Set up local development environment",
-                    "description": "Install Node.js, Docker, and configure AWS CLI",
-                    "priority": "High",
-                    "estimatedHours": 4
-                },
-                {
-                    "id": "BE-102",
-                    "title": "Understand API Gateway architecture",
-                    "description": "Review API Gateway setup and routing logic",
-                    "priority": "High",
-                    "estimatedHours": 6
-                },
-                {
-                    "id": "BE-103",
-                    "title": "Set up DynamoDB local",
-                    "description": "Configure local DynamoDB for development",
-                    "priority": "Medium",
-                    "estimatedHours": 3
-                }
-            ]
+        # Packaged snapshot from the common layer; S3 is only an override
+        tickets = get_dataset('tickets', s3_client, BUCKET_NAME)
         
         # Format response for Bedrock Agent
         response_body = {
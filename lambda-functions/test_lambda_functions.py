@@ -0,0 +1,193 @@
+"""
+Test Lambda Functions (common layer and router helpers)
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Lambda code is importable the way the layer / function zips lay it out
+LAMBDA_DIR = Path(__file__).parent
+sys.path.insert(0, str(LAMBDA_DIR / 'common-layer' / 'python'))
+sys.path.insert(0, str(LAMBDA_DIR / 'bedrock-agent-router'))
+
+from response_envelope import serialize_result
+from s3_stream import read_text
+from summary_ids import summary_id_for
+
+
+class ChunkedBody:
+    """Minimal StreamingBody stand-in that yields fixed-size chunks."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.closed = False
+
+    def iter_chunks(self, chunk_size):
+        for i in range(0, len(self.data), chunk_size):
+            yield self.data[i:i + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+def test_read_text():
+    print("\n🧪 Testing read_text()...")
+    raw = ("Architecture: API Gateway → Lambda → DynamoDB. " * 50).encode('utf-8')
+    for chunk_size in (1, 7, 1024):
+        body = ChunkedBody(raw)
+        assert read_text(body, chunk_size=chunk_size) == (raw.decode('utf-8'), False)
+        assert body.closed, "Body not closed"
+
+    # Cut in the middle of the multi-byte arrow: the partial character is dropped
+    limit = raw.index("→".encode('utf-8')) + 1
+    assert read_text(ChunkedBody(raw), max_bytes=limit, chunk_size=7) == ("Architecture: API Gateway ", True)
+    print("✅ Chunked decode and truncation work at every chunk size")
+
+
+def test_serialize_result():
+    print("\n🧪 Testing serialize_result()...")
+    limit = 2048
+
+    small = {"success": True, "tickets": [{"id": "BE-101"}]}
+    assert json.loads(serialize_result(small, max_bytes=limit)) == small, "Small result changed"
+    assert serialize_result([1, 2, 3], max_bytes=4) == "[1,2,3]", "Non-dict result changed"
+
+    tickets = {"success": True, "tickets": [{"id": f"BE-{i}", "title": "x" * 40} for i in range(200)],
+               "count": 200}
+    body = serialize_result(tickets, max_bytes=limit)
+    parsed = json.loads(body)
+    assert len(body) <= limit and parsed['truncated'], "Ticket list not trimmed to the limit"
+    assert parsed['truncation']['fields'] == ["tickets"] and parsed['count'] == 200
+    assert parsed['tickets'] == tickets['tickets'][:len(parsed['tickets'])], "Trimmed list reordered"
+
+    # Dict payloads such as the glossary are trimmed by entries
+    glossary = {"success": True, "glossary": {f"Term {i}": "definition " * 10 for i in range(300)},
+                "term_count": 300}
+    parsed = json.loads(serialize_result(glossary, max_bytes=limit))
+    assert parsed['truncated'] and 0 < len(parsed['glossary']) < 300, "Glossary not trimmed"
+
+    # Escapes make the encoded string longer than the str itself
+    doc = {"success": True, "content": 'quote " and newline\n' * 500}
+    body = serialize_result(doc, max_bytes=limit)
+    assert len(body) <= limit and json.loads(body)['content'], "Escaped string not trimmed to the limit"
+
+    # Empty or untrimmable values must not loop forever: the error body is used
+    stuck = {"success": True, "tickets": [], **{f"k{i}": i for i in range(1000)}}
+    parsed = json.loads(serialize_result(stuck, max_bytes=limit))
+    assert parsed['error'] == "Response too large for Bedrock Agent" and parsed['truncated']
+
+    nested = {"success": True, "tickets": [], "meta": {f"k{i}": i for i in range(400)}}
+    body = serialize_result(nested, max_bytes=limit)
+    assert len(body) <= limit and json.loads(body)['truncation']['fields'] == ["meta"]
+    print("✅ Oversized results trimmed under the limit, untrimmable ones fall back")
+
+
+def test_reference_data():
+    print("\n🧪 Testing reference_data cold path and override checks...")
+    import hashlib
+    import importlib
+    import os
+    import pickle
+    import tempfile
+    from botocore.exceptions import ClientError
+
+    sys.path.insert(0, str(LAMBDA_DIR / 'common-layer'))
+    from build_reference_snapshot import REPO_DATA_DIR, build_snapshot
+
+    class FakeS3:
+        def __init__(self, content: bytes):
+            self.content = content
+            self.requests = []
+
+        def get_object(self, **request):
+            self.requests.append(request)
+            etag = f'"{hashlib.md5(self.content).hexdigest()}"'
+            if request.get('IfNoneMatch') == etag:
+                raise ClientError({"Error": {"Code": "304"}}, "GetObject")
+            return {"Body": ChunkedBody(self.content), "ETag": etag}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_path = Path(tmp) / 'reference_snapshot.pickle'
+        with open(snapshot_path, 'wb') as f:
+            pickle.dump(build_snapshot(REPO_DATA_DIR), f)
+        os.environ['REFERENCE_SNAPSHOT_PATH'] = str(snapshot_path)
+        try:
+            import reference_data
+            reference_data = importlib.reload(reference_data)
+        finally:
+            del os.environ['REFERENCE_SNAPSHOT_PATH']
+
+    # The documented deploy uploads the same file as the override
+    s3 = FakeS3((REPO_DATA_DIR / 'sample_jira_tickets.json').read_bytes())
+    tickets = reference_data.get_dataset('tickets', s3, 'bucket')
+    assert s3.requests == [], "Cold container waited on S3 instead of serving the snapshot"
+    assert reference_data.data_source('tickets').startswith('snapshot:')
+
+    # Once the interval has passed, an identical override is a 304
+    reference_data._last_checked['tickets'] = float('-inf')
+    assert reference_data.get_dataset('tickets', s3, 'bucket') is tickets
+    assert s3.requests[0]['IfNoneMatch'], "First check did not send the snapshot ETag"
+    assert reference_data.data_source('tickets').startswith('snapshot:')
+
+    # A changed override replaces the snapshot data
+    s3.content = json.dumps([{"id": "BE-999", "title": "Override"}]).encode()
+    reference_data._last_checked['tickets'] = float('-inf')
+    assert reference_data.get_dataset('tickets', s3, 'bucket')[0]['id'] == "BE-999"
+    assert reference_data.data_source('tickets') == 's3-override'
+    print("✅ Snapshot served cold, identical override answered by 304, changed override applied")
+
+
+def test_summary_ids():
+    print("\n🧪 Testing summary_id_for()...")
+    first = summary_id_for("retry-1", "a/b")
+    assert first == summary_id_for("retry-1", "a/b") and first.startswith("a_b_"), "ID not stable per user"
+    assert first != summary_id_for("retry-1", "a_b"), "Users with colliding prefixes share an ID"
+
+    # The write_summary function inlines the scheme (it is deployed without the layer)
+    import importlib.util
+    spec = importlib.util.spec_from_file_location(
+        'write_summary_lambda', LAMBDA_DIR / 'write_summary' / 'lambda_function.py'
+    )
+    write_summary = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(write_summary)
+
+    class FakeS3:
+        def put_object(self, **kwargs):
+            return {}
+
+    write_summary.s3_client = FakeS3()
+    event = {"parameters": [{"name": "summary", "value": "{}"}, {"name": "user_id", "value": "a/b"},
+                            {"name": "idempotency_key", "value": "retry-1"}]}
+    body = json.loads(json.loads(write_summary.lambda_handler(event, None)['body'])['application/json']['body'])
+    assert body['summary_id'] == first, "write_summary ID scheme diverged from the layer"
+    print(f"✅ {first} is user-scoped")
+
+
+def run_all_tests():
+    print("=" * 60)
+    print("🚀 Lambda Functions Test Suite")
+    print("=" * 60)
+
+    try:
+        test_read_text()
+        test_serialize_result()
+        test_reference_data()
+        test_summary_ids()
+
+        print("\n" + "=" * 60)
+        print("✅ All tests passed!")
+        print("=" * 60)
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run_all_tests()
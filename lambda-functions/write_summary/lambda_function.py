@@ -5,8 +5,11 @@ Bedrock Agent Action - Save standup summary
 
 import json
 import boto3
+import hashlib
 import os
+import re
 from datetime import datetime
+from botocore.exceptions import ClientError
 
 s3_client = boto3.client('s3')
 BUCKET_NAME = os.environ.get('S3_BUCKET_NAME', 'onboarding-copilot-docs')
@@ -18,6 +21,8 @@ def lambda_handler(event, context):
     Parameters from Bedrock Agent:
     - summary: The complete summary object
     - user_id: User identifier
+    - idempotency_key: Optional key for the write; defaults to a hash of
+      the summary content, so retries never create duplicate objects
     """
     print(f"Event: {json.dumps(event)}")
     
@@ -26,37 +31,62 @@ def lambda_handler(event, context):
         parameters = event.get('parameters', [])
         summary = {}
         user_id = 'new_joiner'
+        idempotency_key = None
         
         for param in parameters:
             if param.get('name') == 'summary':
                 summary = json.loads(param.get('value', '{}'))
             elif param.get('name') == 'user_id':
                 user_id = param.get('value', user_id)
+            elif param.get('name') == 'idempotency_key':
+                idempotency_key = param.get('value') or None
+        
+        # The ID is derived from the idempotency key (or content hash), so a
+        # retried write maps to the same object
+        if not idempotency_key:
+            idempotency_key = hashlib.sha256(json.dumps(
+                {"user_id": user_id, "summary": summary}, sort_keys=True, default=str
+            ).encode('utf-8')).hexdigest()
+        # Same scheme as common-layer/python/summary_ids.py. This function is
+        # deployed without the layer, so it can't import it; switch to
+        # ``from summary_ids import summary_id_for`` once it is packaged with it.
+        # The hash covers the raw user ID: sanitized IDs can collide.
+        safe_user = re.sub(r'[^A-Za-z0-9._-]', '_', str(user_id))
+        digest = hashlib.sha256(json.dumps([str(user_id), idempotency_key]).encode('utf-8')).hexdigest()
+        summary_id = f"{safe_user}_{digest[:20]}"
         
         # Create summary with metadata
         timestamp = datetime.now().isoformat()
-        summary_id = f"summary_{int(datetime.now().timestamp() * 1000)}"
         
         full_summary = {
             "id": summary_id,
             "user_id": user_id,
             "timestamp": timestamp,
+            "idempotency_key": idempotency_key,
             **summary
         }
         
-        # Save to S3
-        s3_client.put_object(
-            Bucket=BUCKET_NAME,
-            Key=f'summaries/{summary_id}.json',
-            Body=json.dumps(full_summary, indent=2),
-            ContentType='application/json'
-        )
+        # Save to S3 unless an object with this ID already exists
+        try:
+            s3_client.put_object(
+                Bucket=BUCKET_NAME,
+                Key=f'summaries/{summary_id}.json',
+                Body=json.dumps(full_summary, indent=2),
+                ContentType='application/json',
+                IfNoneMatch='*'
+            )
+            duplicate = False
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') not in ('PreconditionFailed', 'ConditionalRequestConflict'):
+                raise
+            duplicate = True
         
         response_body = {
             "application/json": {
                 "body": json.dumps({
                     "success": True,
                     "summary_id": summary_id,
+                    "duplicate": duplicate,
                     "saved_s3": True,
                     "location": f"s3://{BUCKET_NAME}/summaries/{summary_id}.json"
                 })
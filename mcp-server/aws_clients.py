@@ -0,0 +1,244 @@
+"""
+AWS Client Factory
+Configured boto3 clients for the MCP server.
+
+Every client gets a larger connection pool, connect/read timeouts and the
+adaptive retry mode (client-side rate limiting on throttling). Calls go
+through a per-service circuit breaker so a struggling backend fails fast
+instead of tying up every worker, and pool utilization / retry counts are
+tracked for the server metrics.
+
+boto3 itself is only imported, and each client only built, on the first
+API call: loading botocore's service models dominates process startup
+otherwise.
+"""
+
+import os
+import time
+import threading
+from typing import Dict, Any
+
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError, ReadTimeoutError
+
+AWS_REGION = os.getenv('AWS_REGION', 'us-east-1')
+MAX_POOL_CONNECTIONS = int(os.getenv('AWS_MAX_POOL_CONNECTIONS', '50'))
+CONNECT_TIMEOUT = float(os.getenv('AWS_CONNECT_TIMEOUT', '5'))
+READ_TIMEOUT = float(os.getenv('AWS_READ_TIMEOUT', '60'))
+MAX_ATTEMPTS = int(os.getenv('AWS_MAX_ATTEMPTS', '5'))
+
+BREAKER_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_BREAKER_FAILURES', '5'))
+BREAKER_RESET_SECONDS = float(os.getenv('CIRCUIT_BREAKER_RESET_SECONDS', '30'))
+
+# Errors that mean the service is unhealthy. Plain 4xx errors such as
+# NoSuchKey or AccessDenied are the caller's problem and do not trip it.
+_UNHEALTHY_ERROR_CODES = {
+    'ThrottlingException', 'Throttling', 'SlowDown', 'RequestTimeout',
+    'ServiceUnavailable', 'ServiceUnavailableException', 'InternalError',
+    'InternalServerException', 'ModelNotReadyException', 'ModelTimeoutException'
+}
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the service's circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Classic closed / open / half-open circuit breaker.
+
+    After ``failure_threshold`` consecutive unhealthy failures the circuit
+    opens and calls are rejected for ``reset_timeout`` seconds. After that a
+    single call is let through as a probe while everyone else is still
+    rejected; success closes the circuit, failure opens it again. Client
+    errors (4xx) say nothing about the service's health: they neither close
+    nor open the circuit, and a probe that ends in one just frees the slot
+    for the next probe.
+    """
+
+    def __init__(self, service: str, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout: float = BREAKER_RESET_SECONDS):
+        self.service = service
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected_calls = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.state == 'closed':
+                return
+            if self.state == 'open':
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    self.rejected_calls += 1
+                    raise CircuitOpenError(
+                        f"Circuit open for {self.service}; retry in "
+                        f"{self.reset_timeout - (time.monotonic() - self.opened_at):.0f}s"
+                    )
+                self.state = 'half-open'
+            if self._probe_in_flight:
+                self.rejected_calls += 1
+                raise CircuitOpenError(f"Circuit half-open for {self.service}; a probe call is in flight")
+            self._probe_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self.state = 'closed'
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_neutral(self):
+        """A call that failed for the caller's reasons (4xx): no verdict on the service."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._probe_in_flight = False
+            self.consecutive_failures += 1
+            if self.state == 'half-open' or self.consecutive_failures >= self.failure_threshold:
+                if self.state != 'open':
+                    self.times_opened += 1
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected_calls": self.rejected_calls
+        }
+
+
+def _is_unhealthy(error: Exception) -> bool:
+    if isinstance(error, (BotoConnectionError, ReadTimeoutError)):
+        return True
+    if isinstance(error, ClientError):
+        code = error.response.get('Error', {}).get('Code', '')
+        status = error.response.get('ResponseMetadata', {}).get('HTTPStatusCode', 0)
+        return code in _UNHEALTHY_ERROR_CODES or status >= 500
+    return False
+
+
+class InstrumentedClient:
+    """
+    Thin proxy around a boto3 client.
+
+    API calls pass through the service's circuit breaker and update the
+    in-flight / retry counters; everything else (``meta``, paginators,
+    exceptions) is forwarded untouched.
+    """
+
+    def __init__(self, service: str, client_factory, max_pool_connections: int):
+        self._service = service
+        self._client_factory = client_factory
+        self._real_client = None
+        self._breaker = CircuitBreaker(service)
+        self._max_pool = max_pool_connections
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._stats = {"calls": 0, "errors": 0, "retries": 0, "peak_in_flight": 0}
+
+    @property
+    def _client(self):
+        if self._real_client is None:
+            with self._lock:
+                if self._real_client is None:
+                    self._real_client = self._client_factory()
+        return self._real_client
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if not callable(attr) or name.startswith('_') or name in ('get_paginator', 'get_waiter', 'can_paginate'):
+            return attr
+
+        def call(*args, **kwargs):
+            self._breaker.before_call()
+            with self._lock:
+                self._in_flight += 1
+                self._stats['calls'] += 1
+                self._stats['peak_in_flight'] = max(self._stats['peak_in_flight'], self._in_flight)
+            try:
+                response = attr(*args, **kwargs)
+            except Exception as e:
+                metadata = getattr(e, 'response', None) or {}
+                with self._lock:
+                    self._stats['errors'] += 1
+                    self._stats['retries'] += metadata.get('ResponseMetadata', {}).get('RetryAttempts', 0)
+                if _is_unhealthy(e):
+                    self._breaker.record_failure()
+                else:
+                    self._breaker.record_neutral()
+                raise
+            except BaseException:
+                self._breaker.record_neutral()
+                raise
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+
+            if isinstance(response, dict):
+                with self._lock:
+                    self._stats['retries'] += response.get('ResponseMetadata', {}).get('RetryAttempts', 0)
+            self._breaker.record_success()
+            return response
+
+        return call
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            in_flight = self._in_flight
+        return {
+            **stats,
+            "in_flight": in_flight,
+            "max_pool_connections": self._max_pool,
+            "pool_utilization": round(in_flight / self._max_pool, 3),
+            "peak_pool_utilization": round(stats['peak_in_flight'] / self._max_pool, 3),
+            "circuit": self._breaker.snapshot(),
+            "initialized": self._real_client is not None
+        }
+
+
+_clients: Dict[str, InstrumentedClient] = {}
+
+
+def make_client(service: str, read_timeout: float = READ_TIMEOUT) -> InstrumentedClient:
+    """
+    Create a configured, instrumented boto3 client for ``service``.
+
+    The underlying boto3 client is built lazily, on first use.
+
+    Args:
+        service: boto3 service name (e.g. 's3', 'bedrock-runtime')
+        read_timeout: Socket read timeout in seconds
+
+    Returns:
+        The client, also registered for ``client_metrics()``
+    """
+    def build():
+        import boto3
+        from botocore.config import Config
+
+        config = Config(
+            region_name=AWS_REGION,
+            max_pool_connections=MAX_POOL_CONNECTIONS,
+            connect_timeout=CONNECT_TIMEOUT,
+            read_timeout=read_timeout,
+            retries={'mode': 'adaptive', 'max_attempts': MAX_ATTEMPTS}
+        )
+        return boto3.client(service, config=config)
+
+    client = InstrumentedClient(service, build, MAX_POOL_CONNECTIONS)
+    _clients[service] = client
+    return client
+
+
+def client_metrics() -> Dict[str, Any]:
+    """Pool utilization, retry counts and circuit state for every client."""
+    return {service: client.metrics() for service, client in _clients.items()}
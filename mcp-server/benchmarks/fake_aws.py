@@ -0,0 +1,219 @@
+"""
+Local stand-ins for Bedrock and S3, used by the load-test harness.
+
+FakeBedrockRuntime answers invoke_model after a latency sampled from a
+log-normal distribution, and it can inject throttling errors. LocalS3 keeps
+objects in a directory and supports the calls server.py makes:
+- get_object, returning a streaming Body
+- put_object, including IfNoneMatch='*'
+
+Running this module starts the MCP server over streamable HTTP with both
+fakes installed:
+
+    python mcp-server/benchmarks/fake_aws.py --port 8800 --workers 2
+
+Tuning (environment, so every worker process sees the same values):
+    FAKE_BEDROCK_MEDIAN_MS    median model latency (default 800)
+    FAKE_BEDROCK_SIGMA        log-normal sigma, i.e. tail heaviness (default 0.5)
+    FAKE_BEDROCK_ERROR_RATE   fraction of calls that raise ThrottlingException (default 0)
+    FAKE_BEDROCK_MAX_CONCURRENCY  model-side concurrency limit; extra calls queue (default 0 = unlimited)
+    FAKE_S3_ROOT              directory holding the fake bucket and the server's local
+                              summaries / event logs (default /tmp/onboarding-copilot-fake-s3)
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+
+from botocore.exceptions import ClientError
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+TICKET_ID = re.compile(r'\b[A-Z]{2,5}-\d+\b')
+
+
+def _client_error(code: str, message: str, operation: str, status: int = 400) -> ClientError:
+    return ClientError(
+        {'Error': {'Code': code, 'Message': message}, 'ResponseMetadata': {'HTTPStatusCode': status}},
+        operation
+    )
+
+
+class _Body:
+    """Just enough of botocore's StreamingBody for read_s3_text()."""
+
+    def __init__(self, data: bytes):
+        self._stream = io.BytesIO(data)
+
+    def read(self, amt: int = None) -> bytes:
+        return self._stream.read(amt)
+
+    def iter_chunks(self, chunk_size: int = 1024):
+        while True:
+            chunk = self._stream.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def close(self):
+        self._stream.close()
+
+
+class FakeBedrockRuntime:
+    """invoke_model with a configurable latency distribution."""
+
+    def __init__(self, median_ms: float = 800, sigma: float = 0.5,
+                 error_rate: float = 0.0, max_concurrency: int = 0, seed: int = None):
+        self.median_ms = median_ms
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency > 0 else None
+
+    def _latency(self) -> float:
+        # log-normal with the requested median: exp(mu) == median
+        return self._random.lognormvariate(0, self.sigma) * self.median_ms / 1000
+
+    def invoke_model(self, modelId: str, body: str, **kwargs):
+        request = json.loads(body)
+        prompt = request['messages'][0]['content']
+
+        if self._slots:
+            self._slots.acquire()
+        try:
+            time.sleep(self._latency())
+            if self._random.random() < self.error_rate:
+                raise _client_error('ThrottlingException', 'Rate exceeded (fake)', 'InvokeModel', 429)
+        finally:
+            if self._slots:
+                self._slots.release()
+
+        tickets = sorted(set(TICKET_ID.findall(prompt)))[:5]
+        analysis = {
+            "summary": f"Synthetic summary of a {len(prompt)} character prompt.",
+            "relevant_tickets": tickets,
+            "term_explanations": {},
+            "focus_areas": [f"Follow up on {t}" for t in tickets[:2]],
+            "blockers": ["Waiting on review"] if 'blocked' in prompt.lower() else []
+        }
+        text = json.dumps(analysis)
+        payload = {
+            'content': [{'type': 'text', 'text': text}],
+            'usage': {'input_tokens': len(prompt) // 4, 'output_tokens': len(text) // 4}
+        }
+        return {'body': _Body(json.dumps(payload).encode('utf-8')), 'contentType': 'application/json'}
+
+
+class LocalS3:
+    """Directory-backed bucket for get_object / put_object."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _path(self, bucket: str, key: str) -> Path:
+        return self.root / bucket / key
+
+    def get_object(self, Bucket: str, Key: str, **kwargs):
+        path = self._path(Bucket, Key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            raise _client_error('NoSuchKey', 'The specified key does not exist.', 'GetObject', 404)
+        return {'Body': _Body(data), 'ContentLength': len(data), 'ETag': f'"{path.stat().st_mtime_ns:x}"'}
+
+    def put_object(self, Bucket: str, Key: str, Body, IfNoneMatch: str = None, **kwargs):
+        path = self._path(Bucket, Key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = Body.encode('utf-8') if isinstance(Body, str) else Body
+        with self._lock:
+            if IfNoneMatch == '*' and path.exists():
+                raise _client_error('PreconditionFailed', 'At least one of the pre-conditions '
+                                    'you specified did not hold', 'PutObject', 412)
+            path.write_bytes(data)
+        return {'ETag': f'"{path.stat().st_mtime_ns:x}"'}
+
+    def seed_docs(self, bucket: str, data_dir: Path):
+        """Copy the local data/ files into docs/ so get_docs hits the fake bucket."""
+        for source in Path(data_dir).iterdir():
+            if source.is_file() and source.suffix in ('.md', '.json'):
+                target = self._path(bucket, f'docs/{source.name}')
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.write_bytes(source.read_bytes())
+
+
+def install(server_module):
+    """
+    Point server.py at the fakes and keep its local writes out of data/.
+
+    The fakes are wrapped in InstrumentedClient like the real boto3 clients,
+    so load runs exercise the circuit breaker and pool accounting that the
+    server metrics report. Summaries, the analytics event log and the
+    compliance progress log go under FAKE_S3_ROOT instead of the repo.
+    """
+    import aws_clients
+    from standup_analytics import StandupAnalytics
+
+    root = Path(os.getenv('FAKE_S3_ROOT', '/tmp/onboarding-copilot-fake-s3'))
+    s3 = LocalS3(root)
+    s3.seed_docs(server_module.BUCKET_NAME, server_module.DATA_DIR)
+    bedrock = FakeBedrockRuntime(
+        median_ms=float(os.getenv('FAKE_BEDROCK_MEDIAN_MS', '800')),
+        sigma=float(os.getenv('FAKE_BEDROCK_SIGMA', '0.5')),
+        error_rate=float(os.getenv('FAKE_BEDROCK_ERROR_RATE', '0')),
+        max_concurrency=int(os.getenv('FAKE_BEDROCK_MAX_CONCURRENCY', '0'))
+    )
+    for service, fake in (('s3', s3), ('bedrock-runtime', bedrock)):
+        client = aws_clients.InstrumentedClient(service, lambda fake=fake: fake, aws_clients.MAX_POOL_CONNECTIONS)
+        aws_clients._clients[service] = client
+        if service == 's3':
+            server_module.s3_client = client
+        else:
+            server_module.bedrock_runtime = client
+
+    local = root / 'local-data'
+    local.mkdir(parents=True, exist_ok=True)
+    server_module.SUMMARY_DIR = local
+    server_module.COMPLIANCE_PROGRESS_FILE = local / 'compliance_progress.log'
+    server_module._compliance = None
+    server_module.ANALYTICS_EVENTS_FILE = local / 'standup_events.log'
+    server_module.ANALYTICS_PARQUET_PATH = local / 'standup_rollup_rows.parquet'
+    server_module.analytics = StandupAnalytics(server_module.ANALYTICS_EVENTS_FILE)
+
+
+def create_app():
+    """uvicorn factory: server.py's HTTP app with the fakes installed."""
+    if str(SERVER_DIR) not in sys.path:
+        sys.path.insert(0, str(SERVER_DIR))
+    import server
+
+    install(server)
+    return server.create_http_app()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP server backed by fake Bedrock and S3")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8800)
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    if args.workers > 1:
+        os.environ.setdefault('CACHE_BACKEND', 'sqlite')
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    uvicorn.run('fake_aws:create_app', factory=True, host=args.host, port=args.port,
+                workers=args.workers, log_level='warning')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,401 @@
+"""
+Load-test harness: replays synthetic standup traffic against the MCP server.
+
+An asyncio load generator drives the server through real MCP client
+sessions (streamable HTTP). Requests arrive open-loop, with Poisson arrivals
+at each configured rate, so queueing shows up as latency instead of being
+hidden by slow clients. By default the harness starts its own server with
+fake_aws.py:
+- a fake Bedrock with a log-normal latency distribution
+- a directory-backed S3 stand-in
+
+No AWS account is needed.
+
+Each rate stage reports:
+- throughput and p50/p95/p99 latency
+- the error rate, broken down per tool
+- the peak number of in-flight requests
+
+The first stage that misses its target is marked as the saturation point.
+A stage misses when any of these holds:
+- throughput falls below 90% of the offered rate
+- errors exceed --max-error-rate
+- p99 exceeds --p99-slo-ms
+
+Usage:
+    python mcp-server/benchmarks/load_test.py --rates 5 10 20 --duration 20 --clients 50
+    python mcp-server/benchmarks/load_test.py --url http://host:8000/mcp --rates 50 --clients 500
+    python mcp-server/benchmarks/load_test.py --workers 4 --bedrock-median-ms 1500 --report-dir reports/
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from contextlib import AsyncExitStack
+from datetime import datetime, timezone
+from html import escape
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+BENCH_DIR = Path(__file__).resolve().parent
+DATA_DIR = BENCH_DIR.parent.parent / 'data'
+
+# Tool -> share of arrivals
+DEFAULT_MIX = {
+    'process_standup_audio': 0.4,
+    'get_tickets': 0.15,
+    'get_docs': 0.15,
+    'lookup_ticket': 0.15,
+    'explain_terms': 0.15
+}
+
+SPEAKERS = ['Sarah', 'Mike', 'Priya', 'Tom', 'Ana']
+PHRASES = [
+    "um, so yesterday I finished the review on {ticket}",
+    "I'm still blocked on {ticket}, waiting for the {term} change to land",
+    "today I'll, uh, pick up {ticket} and pair with the new joiner",
+    "the {term} setup is flaky again, like, we should look at it",
+    "{ticket} is basically done, just need to, you know, update the docs",
+]
+
+
+def build_corpus(size: int, long_fraction: float, seed: int) -> List[str]:
+    """
+    Synthetic standup transcripts built from the repo's tickets and glossary.
+
+    Every transcript carries a unique tag so analysis caches don't turn the
+    run into a cache benchmark; ``long_fraction`` of them are long enough to
+    take the chunked map-reduce path.
+    """
+    rng = random.Random(seed)
+    tickets = [t['id'] for t in json.loads((DATA_DIR / 'sample_jira_tickets.json').read_text(encoding='utf-8'))]
+    terms = list(json.loads((DATA_DIR / 'team_glossary.json').read_text(encoding='utf-8')))
+
+    corpus = []
+    for i in range(size):
+        turns = rng.randint(120, 200) if rng.random() < long_fraction else rng.randint(6, 20)
+        lines = [f"[00:00] Facilitator: Standup {i}, let's go around."]
+        for n in range(turns):
+            text = rng.choice(PHRASES).format(ticket=rng.choice(tickets), term=rng.choice(terms))
+            lines.append(f"[{n // 60:02d}:{n % 60:02d}] {rng.choice(SPEAKERS)}: {text}.")
+        corpus.append("\n".join(lines))
+    return corpus
+
+
+def tool_arguments(tool: str, rng: random.Random, corpus: List[str], tickets: List[str],
+                   terms: List[str]) -> Dict[str, Any]:
+    if tool == 'process_standup_audio':
+        return {'transcript': rng.choice(corpus), 'user_id': f"load_{rng.randint(0, 999)}"}
+    if tool == 'get_docs':
+        return {'doc_name': 'architecture_overview.md'}
+    if tool == 'lookup_ticket':
+        return {'ticket_id': rng.choice(tickets)}
+    if tool == 'explain_terms':
+        return {'terms': rng.sample(terms, 3)}
+    return {}
+
+
+def _tool_failed(result) -> str:
+    """Error kind for a tool result, or '' if it succeeded."""
+    if result.isError:
+        return 'tool_exception'
+    payload = result.structuredContent
+    if payload is None and result.content:
+        try:
+            payload = json.loads(result.content[0].text)
+        except (ValueError, AttributeError):
+            return ''
+    if isinstance(payload, dict) and payload.get('success') is False:
+        return 'tool_error'
+    return ''
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values), max(1, math.ceil(pct / 100 * len(sorted_values)))) - 1
+    return sorted_values[rank]
+
+
+def _latency_summary(latencies: List[float]) -> Dict[str, float]:
+    latencies = sorted(latencies)
+    return {
+        'p50': round(percentile(latencies, 50), 1),
+        'p95': round(percentile(latencies, 95), 1),
+        'p99': round(percentile(latencies, 99), 1),
+        'max': round(latencies[-1], 1) if latencies else 0.0
+    }
+
+
+async def run_stage(sessions: List[ClientSession], rate: float, duration: float, mix: Dict[str, float],
+                    corpus: List[str], tickets: List[str], terms: List[str], timeout: float,
+                    rng: random.Random) -> Dict[str, Any]:
+    """Fire Poisson arrivals at ``rate``/s for ``duration`` seconds and wait for them all."""
+    samples = []
+    state = {'in_flight': 0, 'peak': 0}
+    tools, weights = zip(*mix.items())
+
+    async def one_call(session: ClientSession, tool: str, args: Dict[str, Any]):
+        state['in_flight'] += 1
+        state['peak'] = max(state['peak'], state['in_flight'])
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(session.call_tool(tool, args), timeout)
+            error = _tool_failed(result)
+        except asyncio.TimeoutError:
+            error = 'timeout'
+        except Exception as e:
+            error = type(e).__name__
+        finally:
+            state['in_flight'] -= 1
+        samples.append((tool, (time.perf_counter() - started) * 1000, error))
+
+    tasks = []
+    stage_start = time.perf_counter()
+    next_arrival = stage_start
+    i = 0
+    while next_arrival - stage_start < duration:
+        delay = next_arrival - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tool = rng.choices(tools, weights)[0]
+        args = tool_arguments(tool, rng, corpus, tickets, terms)
+        tasks.append(asyncio.create_task(one_call(sessions[i % len(sessions)], tool, args)))
+        i += 1
+        next_arrival += rng.expovariate(rate)
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - stage_start
+
+    ok = [latency for _, latency, error in samples if not error]
+    errors: Dict[str, int] = {}
+    for _, _, error in samples:
+        if error:
+            errors[error] = errors.get(error, 0) + 1
+
+    per_tool = {}
+    for tool in tools:
+        tool_samples = [s for s in samples if s[0] == tool]
+        if not tool_samples:
+            continue
+        per_tool[tool] = {
+            'requests': len(tool_samples),
+            'errors': sum(1 for s in tool_samples if s[2]),
+            'latency_ms': _latency_summary([s[1] for s in tool_samples if not s[2]])
+        }
+
+    return {
+        'offered_rps': rate,
+        'requests': len(samples),
+        'succeeded': len(ok),
+        'achieved_rps': round(len(ok) / elapsed, 2),
+        'error_rate': round((len(samples) - len(ok)) / len(samples), 4) if samples else 0.0,
+        'errors': errors,
+        'latency_ms': _latency_summary(ok),
+        'max_in_flight': state['peak'],
+        'elapsed_seconds': round(elapsed, 2),
+        'per_tool': per_tool
+    }
+
+
+async def run_load_test(url: str, rates: List[float], duration: float, clients: int,
+                        mix: Dict[str, float], corpus: List[str], timeout: float,
+                        seed: int, max_error_rate: float, p99_slo_ms: float) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    tickets = [t['id'] for t in json.loads((DATA_DIR / 'sample_jira_tickets.json').read_text(encoding='utf-8'))]
+    terms = list(json.loads((DATA_DIR / 'team_glossary.json').read_text(encoding='utf-8')))
+
+    async with AsyncExitStack() as stack:
+        sessions = []
+        for _ in range(clients):
+            read, write, _ = await stack.enter_async_context(streamablehttp_client(url, timeout=timeout))
+            session = await stack.enter_async_context(ClientSession(read, write))
+            await session.initialize()
+            sessions.append(session)
+        print(f"🔌 {clients} MCP client sessions connected to {url}")
+
+        stages = []
+        saturation = None
+        for rate in rates:
+            print(f"🚦 Stage: {rate} req/s for {duration}s...")
+            stage = await run_stage(sessions, rate, duration, mix, corpus, tickets, terms, timeout, rng)
+            stage['saturated'] = (
+                stage['achieved_rps'] < 0.9 * rate
+                or stage['error_rate'] > max_error_rate
+                or stage['latency_ms']['p99'] > p99_slo_ms
+            )
+            if stage['saturated'] and saturation is None:
+                saturation = rate
+            stages.append(stage)
+            print(f"   {stage['achieved_rps']} req/s, p50 {stage['latency_ms']['p50']} ms, "
+                  f"p99 {stage['latency_ms']['p99']} ms, errors {stage['error_rate']:.1%}"
+                  f"{'  ⚠️  saturated' if stage['saturated'] else ''}")
+
+    return {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'config': {
+            'url': url,
+            'rates': rates,
+            'duration_seconds': duration,
+            'clients': clients,
+            'mix': mix,
+            'corpus_size': len(corpus),
+            'timeout_seconds': timeout,
+            'max_error_rate': max_error_rate,
+            'p99_slo_ms': p99_slo_ms
+        },
+        'stages': stages,
+        'saturation_point_rps': saturation,
+        'max_sustained_rps': max((s['achieved_rps'] for s in stages if not s['saturated']), default=None)
+    }
+
+
+def render_html(report: Dict[str, Any]) -> str:
+    """Self-contained HTML report: stage table, per-tool table and a latency chart."""
+    stages = report['stages']
+    rows = "".join(
+        f"<tr class=\"{'bad' if s['saturated'] else ''}\"><td>{s['offered_rps']}</td><td>{s['achieved_rps']}</td>"
+        f"<td>{s['requests']}</td><td>{s['error_rate']:.1%}</td><td>{s['latency_ms']['p50']}</td>"
+        f"<td>{s['latency_ms']['p95']}</td><td>{s['latency_ms']['p99']}</td><td>{s['max_in_flight']}</td>"
+        f"<td>{'yes' if s['saturated'] else ''}</td></tr>"
+        for s in stages
+    )
+    tool_rows = "".join(
+        f"<tr><td>{s['offered_rps']}</td><td>{escape(tool)}</td><td>{t['requests']}</td><td>{t['errors']}</td>"
+        f"<td>{t['latency_ms']['p50']}</td><td>{t['latency_ms']['p95']}</td><td>{t['latency_ms']['p99']}</td></tr>"
+        for s in stages for tool, t in s['per_tool'].items()
+    )
+
+    # Grouped bars: p50/p95/p99 per stage
+    width, height, pad = 640, 260, 40
+    top = max([s['latency_ms']['p99'] for s in stages] + [1])
+    group = (width - 2 * pad) / max(len(stages), 1)
+    bars = []
+    for i, s in enumerate(stages):
+        for j, (key, color) in enumerate((('p50', '#4c9f70'), ('p95', '#e0a030'), ('p99', '#d05050'))):
+            h = s['latency_ms'][key] / top * (height - 2 * pad)
+            x = pad + i * group + j * group / 4 + group / 8
+            bars.append(f"<rect x=\"{x:.1f}\" y=\"{height - pad - h:.1f}\" width=\"{group / 4 - 2:.1f}\" "
+                        f"height=\"{h:.1f}\" fill=\"{color}\"><title>{key} {s['latency_ms'][key]} ms</title></rect>")
+        bars.append(f"<text x=\"{pad + i * group + group / 2:.1f}\" y=\"{height - pad + 16}\" "
+                    f"text-anchor=\"middle\">{s['offered_rps']}/s</text>")
+    chart = (f"<svg width=\"{width}\" height=\"{height}\" font-size=\"11\">"
+             f"<text x=\"{pad}\" y=\"20\">latency (ms), max {top}</text>{''.join(bars)}</svg>")
+
+    config = escape(json.dumps(report['config'], indent=2))
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>MCP load test {escape(report['generated_at'])}</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; margin-bottom: 2em; }}
+td, th {{ border: 1px solid #ccc; padding: 4px 10px; text-align: right; }}
+tr.bad {{ background: #fbe3e3; }}
+</style></head><body>
+<h1>MCP server load test</h1>
+<p>Generated {escape(report['generated_at'])}. Saturation point: <b>{report['saturation_point_rps'] or 'not reached'}</b>
+req/s offered; max sustained throughput: <b>{report['max_sustained_rps']}</b> req/s.</p>
+<h2>Stages</h2>
+<table><tr><th>offered/s</th><th>achieved/s</th><th>requests</th><th>errors</th><th>p50 ms</th>
+<th>p95 ms</th><th>p99 ms</th><th>peak in-flight</th><th>saturated</th></tr>{rows}</table>
+{chart}
+<h2>Per tool</h2>
+<table><tr><th>offered/s</th><th>tool</th><th>requests</th><th>errors</th><th>p50 ms</th><th>p95 ms</th>
+<th>p99 ms</th></tr>{tool_rows}</table>
+<h2>Configuration</h2><pre>{config}</pre>
+</body></html>
+"""
+
+
+def export_report(report: Dict[str, Any], report_dir: Path) -> List[Path]:
+    report_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    json_path = report_dir / f'load_test_{stamp}.json'
+    html_path = report_dir / f'load_test_{stamp}.html'
+    json_path.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    html_path.write_text(render_html(report), encoding='utf-8')
+    return [json_path, html_path]
+
+
+def start_fake_server(port: int, workers: int, args) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        FAKE_BEDROCK_MEDIAN_MS=str(args.bedrock_median_ms),
+        FAKE_BEDROCK_SIGMA=str(args.bedrock_sigma),
+        FAKE_BEDROCK_ERROR_RATE=str(args.bedrock_error_rate),
+        FAKE_BEDROCK_MAX_CONCURRENCY=str(args.bedrock_max_concurrency)
+    )
+    proc = subprocess.Popen(
+        [sys.executable, str(BENCH_DIR / 'fake_aws.py'), '--port', str(port), '--workers', str(workers)],
+        env=env, stdout=subprocess.DEVNULL
+    )
+    url = f"http://127.0.0.1:{port}/mcp"
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("Fake-AWS MCP server exited during startup")
+        try:
+            httpx.get(url, timeout=1)
+            return proc
+        except httpx.TransportError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError(f"Fake-AWS MCP server did not start on {url}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay synthetic standup traffic against the MCP server")
+    parser.add_argument('--url', help="Target an already running server instead of starting one")
+    parser.add_argument('--port', type=int, default=8800)
+    parser.add_argument('--workers', type=int, default=1, help="Worker processes for the started server")
+    parser.add_argument('--rates', type=float, nargs='+', default=[2, 5, 10, 20])
+    parser.add_argument('--duration', type=float, default=15, help="Seconds per rate stage")
+    parser.add_argument('--clients', type=int, default=50, help="Concurrent MCP client sessions")
+    parser.add_argument('--mix', type=json.loads, default=DEFAULT_MIX, help="JSON {tool: weight}")
+    parser.add_argument('--corpus-size', type=int, default=200)
+    parser.add_argument('--long-fraction', type=float, default=0.1)
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--max-error-rate', type=float, default=0.01)
+    parser.add_argument('--p99-slo-ms', type=float, default=10000)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--bedrock-median-ms', type=float, default=800)
+    parser.add_argument('--bedrock-sigma', type=float, default=0.5)
+    parser.add_argument('--bedrock-error-rate', type=float, default=0.0)
+    parser.add_argument('--bedrock-max-concurrency', type=int, default=0)
+    parser.add_argument('--report-dir', type=Path, default=Path('load-test-reports'))
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.corpus_size, args.long_fraction, args.seed)
+    server = None
+    url = args.url
+    if not url:
+        print(f"🧪 Starting MCP server with fake Bedrock (median {args.bedrock_median_ms} ms) "
+              f"and local S3, {args.workers} worker(s)...")
+        server = start_fake_server(args.port, args.workers, args)
+        url = f"http://127.0.0.1:{args.port}/mcp"
+
+    try:
+        report = asyncio.run(run_load_test(
+            url, args.rates, args.duration, args.clients, args.mix, corpus,
+            args.timeout, args.seed, args.max_error_rate, args.p99_slo_ms
+        ))
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=10)
+
+    for path in export_report(report, args.report_dir):
+        print(f"📄 Wrote {path}")
+
+
+if __name__ == '__main__':
+    main()
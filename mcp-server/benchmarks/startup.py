@@ -0,0 +1,89 @@
+"""
+Startup benchmark for the stdio MCP server.
+
+Two measurements:
+- ``-X importtime`` breakdown of ``import server``: total import time and
+  the slowest modules, grouped by top-level package, so it's clear whether
+  time goes to our code or to dependencies.
+- Time to first ``list_tools``: spawns ``server.py`` over stdio the way an
+  MCP client does and times spawn -> initialize -> list_tools, repeated
+  ``--runs`` times.
+
+Usage:
+    python mcp-server/benchmarks/startup.py [--runs 5] [--target-ms 200]
+"""
+
+import argparse
+import asyncio
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+_IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+
+def import_breakdown(top: int = 15):
+    """Run ``python -X importtime -c 'import server'`` and summarize it."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import server'],
+        cwd=SERVER_DIR, capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent)))
+
+    total_us = next((cum for module, _, cum, _ in rows if module == 'server'), 0)
+    by_package = {}
+    for module, self_us, _, _ in rows:
+        package = module.split('.')[0]
+        by_package[package] = by_package.get(package, 0) + self_us
+
+    print(f"import server: {total_us / 1000:.0f} ms total")
+    print(f"\n{'top-level package':<28}{'self ms':>10}")
+    for package, self_us in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"{package:<28}{self_us / 1000:>10.1f}")
+    print(f"\n{'slowest modules (self)':<52}{'self ms':>10}{'cum ms':>10}")
+    for module, self_us, cumulative_us, _ in sorted(rows, key=lambda r: -r[1])[:top]:
+        print(f"{module:<52}{self_us / 1000:>10.1f}{cumulative_us / 1000:>10.1f}")
+    return total_us / 1000
+
+
+async def time_to_list_tools() -> float:
+    params = StdioServerParameters(command=sys.executable, args=[str(SERVER_DIR / 'server.py')], cwd=str(SERVER_DIR))
+    started = time.perf_counter()
+    async with stdio_client(params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            tools = await session.list_tools()
+            elapsed = (time.perf_counter() - started) * 1000
+    assert tools.tools, "Server listed no tools"
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP server startup benchmark")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--target-ms', type=float, default=200)
+    args = parser.parse_args()
+
+    import_breakdown()
+
+    timings = [asyncio.run(time_to_list_tools()) for _ in range(args.runs)]
+    median = statistics.median(timings)
+    print(f"\nspawn -> list_tools over stdio: median {median:.0f} ms, "
+          f"min {min(timings):.0f} ms, max {max(timings):.0f} ms ({args.runs} runs)")
+    print(f"target {args.target_ms:.0f} ms: {'met' if median <= args.target_ms else 'missed'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: MCP server throughput vs number of HTTP worker processes.
+
+Starts ``server.py --transport streamable-http --workers N`` for each N,
+fires concurrent JSON-RPC ``tools/call`` requests at the CPU-bound
+clean_transcript tool and reports requests/second. No AWS calls are made.
+
+Usage:
+    python mcp-server/benchmarks/worker_scaling.py [--workers 1 2 4] [--requests 400] [--concurrency 16]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+HEADERS = {'Accept': 'application/json, text/event-stream', 'Content-Type': 'application/json'}
+
+TRANSCRIPT = "\n".join(
+    f"[00:{i % 60:02d}] Speaker{i % 4}: Um, so like I I was working on on BE-{100 + i % 9}, "
+    f"uh, the Lambda timeout thing, you know, and it's it's basically done."
+    for i in range(400)
+)
+
+
+def _wait_ready(url: str, timeout: float = 30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            httpx.post(url, headers=HEADERS, json={"jsonrpc": "2.0", "id": 0, "method": "tools/list"}, timeout=2)
+            return
+        except httpx.TransportError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not start")
+
+
+def run(workers: int, requests: int, concurrency: int, port: int) -> float:
+    env = dict(os.environ, CACHE_BACKEND='memory')
+    proc = subprocess.Popen(
+        [sys.executable, 'server.py', '--transport', 'streamable-http', '--port', str(port), '--workers', str(workers)],
+        cwd=SERVER_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f"http://127.0.0.1:{port}/mcp"
+    try:
+        _wait_ready(url)
+        body = {"jsonrpc": "2.0", "id": 1, "method": "tools/call",
+                "params": {"name": "clean_transcript", "arguments": {"transcript": TRANSCRIPT}}}
+
+        with httpx.Client(headers=HEADERS, timeout=60) as client:
+            def call(_):
+                return client.post(url, json=body).status_code
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                statuses = list(pool.map(call, range(requests)))
+            elapsed = time.perf_counter() - start
+
+        errors = sum(1 for s in statuses if s != 200)
+        if errors:
+            print(f"  workers={workers}: {errors} non-200 responses")
+        return requests / elapsed
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP server worker scaling benchmark")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"CPUs: {os.cpu_count()}, transcript: {len(TRANSCRIPT)} chars")
+    print(f"{'workers':>8}{'req/s':>10}{'speedup':>10}")
+    baseline = None
+    for n in args.workers:
+        rps = run(n, args.requests, args.concurrency, args.port)
+        baseline = baseline or rps
+        print(f"{n:>8}{rps:>10.1f}{rps / baseline:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
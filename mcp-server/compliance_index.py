@@ -0,0 +1,172 @@
+"""
+Compliance Index
+Precomputed compliance checklist with per-user completion tracking.
+
+Requirements are loaded once and each one gets a bit position, so a user's progress is a single int
+bitset. Pending items for a user are ``all_mask & ~completed``, and the
+decoded list for each distinct mask is memoized - most users share one of a
+handful of progress states, so lookups are O(1) per user.
+
+Progress is persisted to an append-only log of ``user_id<TAB>id,id,...``
+lines, each holding only the requirements that call newly completed.
+Completion never shrinks, so replay ORs a user's lines together and two
+worker processes appending for the same user at once can't lose either
+write. Requirement ids (not bit positions) are stored so reordering the
+requirements file never corrupts anyone's progress. Every query first
+applies the lines appended since the last read, so worker processes that
+share the log see each other's progress.
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class ComplianceIndex:
+    """In-memory compliance checklist index with bitset progress per user."""
+
+    def __init__(self, requirements_path: Path, progress_path: Optional[Path] = None):
+        with open(requirements_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        self.framework = data.get('framework', 'SOC2')
+        self.requirements: List[Dict[str, Any]] = data.get('requirements', [])
+        self.bit_by_id = {req['id']: 1 << i for i, req in enumerate(self.requirements)}
+
+        self.all_mask = (1 << len(self.requirements)) - 1
+        self.mandatory_mask = sum(
+            self.bit_by_id[req['id']] for req in self.requirements if req.get('mandatory', False)
+        )
+
+        self.progress_path = Path(progress_path) if progress_path else None
+        self._completed: Dict[str, int] = {}
+        self._decoded: Dict[int, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._log_identity = None
+        self._offset = 0
+        self._catch_up()
+
+    # ------------------------------------------------------------------
+    # Bitset helpers
+    # ------------------------------------------------------------------
+
+    def _mask_for(self, requirement_ids: Iterable[str]) -> int:
+        mask = 0
+        for requirement_id in requirement_ids:
+            if requirement_id not in self.bit_by_id:
+                raise ValueError(f"Unknown compliance requirement: {requirement_id}")
+            mask |= self.bit_by_id[requirement_id]
+        return mask
+
+    def _decode(self, mask: int) -> List[Dict[str, Any]]:
+        """Requirements whose bits are set in ``mask`` (memoized per mask)."""
+        items = self._decoded.get(mask)
+        if items is None:
+            items = [req for i, req in enumerate(self.requirements) if mask >> i & 1]
+            self._decoded[mask] = items
+        return items
+
+    def _catch_up(self):
+        """Apply progress lines appended since the last read (by any process)."""
+        if not self.progress_path:
+            return
+        try:
+            st = self.progress_path.stat()
+        except FileNotFoundError:
+            return
+        identity = (st.st_dev, st.st_ino)
+        if identity != self._log_identity or st.st_size < self._offset:
+            # First read, or the log was replaced: replay it from the start
+            self._completed, self._log_identity, self._offset = {}, identity, 0
+        if st.st_size == self._offset:
+            return
+        with open(self.progress_path, 'rb') as f:
+            f.seek(self._offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # another process is still writing this line
+                self._offset += len(raw)
+                user_id, _, ids = raw.decode('utf-8', errors='replace').rstrip('\n').partition('\t')
+                if user_id:
+                    # Lines add to the user's progress; ids that were
+                    # removed from the requirements file are ignored
+                    mask = 0
+                    for requirement_id in ids.split(','):
+                        mask |= self.bit_by_id.get(requirement_id, 0)
+                    self._completed[user_id] = self._completed.get(user_id, 0) | mask
+
+    def _append_progress(self, user_id: str, mask: int):
+        if not self.progress_path:
+            return
+        self.progress_path.parent.mkdir(parents=True, exist_ok=True)
+        ids = ','.join(req['id'] for req in self._decode(mask))
+        with open(self.progress_path, 'a', encoding='utf-8') as f:
+            f.write(f"{user_id}\t{ids}\n")
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def completed_mask(self, user_id: str) -> int:
+        with self._lock:
+            self._catch_up()
+            return self._completed.get(user_id, 0)
+
+    def completed(self, user_id: str) -> List[Dict[str, Any]]:
+        return self._decode(self.completed_mask(user_id))
+
+    def pending(self, user_id: str, mandatory_only: bool = False) -> List[Dict[str, Any]]:
+        """Requirements the user has not completed yet, in file order."""
+        scope = self.mandatory_mask if mandatory_only else self.all_mask
+        return self._decode(scope & ~self.completed_mask(user_id))
+
+    def is_compliant(self, user_id: str) -> bool:
+        """True once every mandatory requirement is complete."""
+        return self.mandatory_mask & ~self.completed_mask(user_id) == 0
+
+    def mark_complete(self, user_id: str, requirement_ids: Iterable[str]) -> int:
+        """Record completed requirements for a user and return the new mask."""
+        mask = self._mask_for(requirement_ids)
+        with self._lock:
+            self._catch_up()
+            current = self._completed.get(user_id, 0)
+            new_mask = current | mask
+            if new_mask != current:
+                # Only the newly completed ids are logged. Our own line is
+                # re-read by the next catch-up; ORing it again is harmless
+                self._completed[user_id] = new_mask
+                self._append_progress(user_id, new_mask & ~current)
+        return new_mask
+
+    def export_evidence(self, user_ids: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Evidence rows for many users at once.
+
+        Args:
+            user_ids: Users to export; defaults to everyone with recorded progress
+        """
+        with self._lock:
+            self._catch_up()
+            completed = dict(self._completed)
+        if user_ids is None:
+            user_ids = list(completed)
+
+        # Rows for users in the same progress state share the decoded id lists
+        id_lists: Dict[int, List[str]] = {}
+        rows = []
+        for user_id in user_ids:
+            mask = completed.get(user_id, 0)
+            completed_ids = id_lists.get(mask)
+            if completed_ids is None:
+                completed_ids = id_lists[mask] = [req['id'] for req in self._decode(mask)]
+            missing_mandatory = self.mandatory_mask & ~mask
+            rows.append({
+                "user_id": user_id,
+                "framework": self.framework,
+                "completed": completed_ids,
+                "completed_count": len(completed_ids),
+                "mandatory_pending": bin(missing_mandatory).count('1'),
+                "compliant": missing_mandatory == 0
+            })
+        return rows
@@ -0,0 +1,138 @@
+"""
+Team Context Bundle
+Precomputes the transcript-independent context a standup analysis needs.
+
+Tickets, the architecture doc and the glossary only depend on the team's
+reference data. A background thread therefore rebuilds them into one
+immutable bundle:
+- whenever a source file changes, and
+- on a fixed schedule (for sources like S3 that can't be watched).
+
+A standup request then only adds transcript-specific work on top.
+
+Readers always get the last good bundle. If a rebuild fails, the previous
+bundle stays in place until the next attempt.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+
+class ContextBundleScheduler:
+    """Keeps a prebuilt context bundle fresh in the background."""
+
+    def __init__(self, build: Callable[[], Dict[str, Any]], sources: Iterable[Path],
+                 refresh_seconds: float = 300, poll_seconds: float = 5):
+        """
+        Args:
+            build: Returns a new bundle (a dict, treated as read-only once published)
+            sources: Files whose modification invalidates the bundle
+            refresh_seconds: Rebuild at least this often even without changes
+            poll_seconds: How often the background thread checks the sources
+        """
+        self._build = build
+        self.sources = [Path(p) for p in sources]
+        self.refresh_seconds = refresh_seconds
+        self.poll_seconds = poll_seconds
+
+        self._bundle: Optional[Dict[str, Any]] = None
+        self._fingerprint: Optional[Tuple] = None
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"builds": 0, "failures": 0, "last_reason": None, "last_build_ms": 0.0, "last_error": None}
+
+    def _source_fingerprint(self) -> Tuple:
+        fingerprint = []
+        for path in self.sources:
+            try:
+                stat = path.stat()
+                fingerprint.append((str(path), stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                fingerprint.append((str(path), None, None))
+        return tuple(fingerprint)
+
+    def refresh(self, reason: str = "manual") -> Dict[str, Any]:
+        """Rebuild the bundle now; on failure keep (and return) the current one."""
+        with self._lock:
+            fingerprint = self._source_fingerprint()
+            started = time.perf_counter()
+            try:
+                bundle = self._build()
+            except Exception as e:
+                self.stats['failures'] += 1
+                self.stats['last_error'] = str(e)
+                print(f"⚠️  Context bundle rebuild ({reason}) failed: {e}", file=sys.stderr)
+                if self._bundle is None:
+                    raise
+                return self._bundle
+
+            self._bundle = bundle
+            self._fingerprint = fingerprint
+            self._built_at = time.monotonic()
+            self.stats['builds'] += 1
+            self.stats['last_reason'] = reason
+            self.stats['last_build_ms'] = round((time.perf_counter() - started) * 1000, 2)
+            self.stats['last_error'] = None
+            return bundle
+
+    def get(self) -> Dict[str, Any]:
+        """Current bundle (built synchronously if the scheduler hasn't produced one yet)."""
+        bundle = self._bundle
+        if bundle is not None:
+            return bundle
+        with self._lock:
+            if self._bundle is not None:
+                return self._bundle
+        return self.refresh("first use")
+
+    def poll_once(self) -> bool:
+        """Rebuild if a source changed or the bundle is due; True if it rebuilt."""
+        if self._bundle is None:
+            self.refresh("initial")
+            return True
+        if self._source_fingerprint() != self._fingerprint:
+            self.refresh("source changed")
+            return True
+        if time.monotonic() - self._built_at >= self.refresh_seconds:
+            self.refresh("scheduled")
+            return True
+        return False
+
+    def _run(self, delay: float):
+        # Let the server finish starting before competing with it for CPU
+        if delay and self._stop.wait(delay):
+            return
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception:
+                pass  # already logged by refresh(); retry on the next poll
+            self._stop.wait(self.poll_seconds)
+
+    def start(self, delay: float = 0.0):
+        """Start the background refresh thread (idempotent), first build after ``delay`` seconds."""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, args=(delay,), name="context-bundle", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_seconds + 1)
+
+    def metrics(self) -> Dict[str, Any]:
+        bundle = self._bundle
+        return {
+            "version": bundle.get('version') if bundle else None,
+            "age_seconds": round(time.monotonic() - self._built_at, 1) if bundle else None,
+            "background_thread": bool(self._thread and self._thread.is_alive()),
+            **self.stats
+        }
@@ -0,0 +1,110 @@
+"""
+Parsed Reference Data Cache
+Loads the JSON files under data/ at most once per process and, optionally,
+once per host.
+
+Parsed data is kept in memory and keyed by file mtime and size, so an edited
+file is picked up on the next call. When a cache directory is configured,
+the parsed object is also pickled there. A new server process (stdio
+clients spawn one per session) then loads it with pickle instead of
+re-parsing JSON.
+
+Unpickling runs code, so the disk cache is only used when the directory
+and the pickle file belong to the current user and nobody else can write
+to them. Anything else falls back to parsing the JSON.
+
+Returned objects are shared between callers; treat them as read-only.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import stat
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+_memory: Dict[Path, Tuple[Tuple[int, int], Any]] = {}
+_lock = threading.Lock()
+_MISSING = object()
+stats = {"memory_hits": 0, "disk_hits": 0, "parses": 0}
+
+
+def _pickle_path(path: Path, cache_dir: Path) -> Path:
+    tag = hashlib.sha1(str(path.resolve()).encode('utf-8')).hexdigest()[:10]
+    return cache_dir / f"{path.name}.{tag}.pickle"
+
+
+def _private(st: os.stat_result) -> bool:
+    """True if ``st`` belongs to this user and is not group/world writable."""
+    if st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        return False
+    return not hasattr(os, 'getuid') or st.st_uid == os.getuid()
+
+
+def _private_cache_dir(cache_dir: Path) -> bool:
+    """Create ``cache_dir`` (0700) if needed; True if it is safe to unpickle from."""
+    try:
+        cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        return _private(cache_dir.stat())
+    except OSError:
+        return False
+
+
+def load_json(path: Path, cache_dir: Optional[Path] = None) -> Any:
+    """
+    Parsed contents of the JSON file at ``path``.
+
+    Args:
+        path: JSON file
+        cache_dir: Directory for the on-disk pickle cache (None = memory only).
+            Ignored unless it is private to the current user.
+    """
+    path = Path(path)
+    st = path.stat()
+    signature = (st.st_mtime_ns, st.st_size)
+
+    cached = _memory.get(path)
+    if cached and cached[0] == signature:
+        stats['memory_hits'] += 1
+        return cached[1]
+
+    with _lock:
+        cached = _memory.get(path)
+        if cached and cached[0] == signature:
+            stats['memory_hits'] += 1
+            return cached[1]
+
+        data = _MISSING
+        pickle_file = None
+        if cache_dir and _private_cache_dir(Path(cache_dir)):
+            pickle_file = _pickle_path(path, Path(cache_dir))
+        if pickle_file is not None:
+            try:
+                with open(pickle_file, 'rb') as f:
+                    if not _private(os.fstat(f.fileno())):
+                        raise ValueError(f"{pickle_file} is writable by other users")
+                    stored_signature, stored = pickle.load(f)
+                if tuple(stored_signature) == signature:
+                    data = stored
+                    stats['disk_hits'] += 1
+            except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+                pass  # missing or unreadable cache file: parse the JSON instead
+
+        if data is _MISSING:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            stats['parses'] += 1
+            if pickle_file is not None:
+                try:
+                    tmp = pickle_file.with_name(f".{pickle_file.name}.{os.getpid()}.tmp")
+                    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                    with open(fd, 'wb') as f:
+                        pickle.dump((signature, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+                    os.replace(tmp, pickle_file)
+                except OSError:
+                    pass  # read-only checkout: the memory cache still applies
+
+        _memory[path] = (signature, data)
+        return data
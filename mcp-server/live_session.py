@@ -0,0 +1,183 @@
+"""
+Live Standup Sessions
+Incremental analysis over transcript segments that arrive during a meeting.
+
+Each segment is cleaned and scanned with cheap local matchers (ticket IDs,
+glossary terms, blocker phrases), so running results are available right
+away. The model is called only on meaningful deltas:
+- once enough new text has accumulated, or
+- once a new ticket or blocker shows up together with a minimum amount of text.
+
+Those delta analyses run in the background. At the end of the meeting only
+the last delta and the cheap merge are left to do.
+
+Sessions live in the memory of the server process that created them. With
+several HTTP workers, clients must stay on one worker (sticky routing) or
+use stdio.
+"""
+
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import Executor, Future, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from transcript_preprocessor import preprocess_transcript
+
+BLOCKER_PATTERN = re.compile(
+    r"\b(?:blocked|blocker|stuck|waiting (?:on|for)|can't proceed|depends on)\b", re.IGNORECASE
+)
+_SENTENCES = re.compile(r'(?<=[.!?])\s+|\n+')
+
+
+class LiveStandupSession:
+    """Accumulates transcript segments and their analyses for one meeting."""
+
+    def __init__(self, user_id: str, ticket_pattern: re.Pattern, term_pattern: Optional[re.Pattern],
+                 analyze_delta: Callable[[str, int], Dict[str, Any]], executor: Executor,
+                 min_delta_chars: int = 1200, max_delta_chars: int = 4000, ticket_prefixes: Tuple[str, ...] = ()):
+        """
+        Args:
+            user_id: New joiner the final summary is written for
+            ticket_pattern: Regex matching ticket IDs
+            term_pattern: Regex matching glossary terms (None if no glossary)
+            analyze_delta: ``(text, index) -> partial analysis`` model call
+            executor: Runs delta analyses in the background
+            min_delta_chars: Smallest delta analyzed early when a new ticket/blocker appears
+            max_delta_chars: Delta size that always triggers an analysis
+            ticket_prefixes: Project prefixes whose spoken ticket IDs are normalized
+        """
+        self.session_id = uuid.uuid4().hex[:16]
+        self.user_id = user_id
+        self.ticket_pattern = ticket_pattern
+        self.term_pattern = term_pattern
+        self.ticket_prefixes = tuple(ticket_prefixes)
+        self.min_delta_chars = min_delta_chars
+        self.max_delta_chars = max_delta_chars
+        self._analyze_delta = analyze_delta
+        self._executor = executor
+
+        self.segments: List[str] = []
+        self.tickets: List[str] = []
+        self.terms: List[str] = []
+        self.blockers: List[str] = []
+        self._pending: List[str] = []
+        self._pending_chars = 0
+        self._new_signal = False
+        self._partials: List[Future] = []
+        self._lock = threading.Lock()
+        self.finished = False
+        self.last_active = time.monotonic()
+        self.stats = {"segments": 0, "original_chars": 0, "processed_chars": 0, "delta_analyses": 0}
+
+    def _match(self, text: str) -> bool:
+        """Update running matches from ``text``; True if a new ticket or blocker showed up."""
+        new_signal = False
+        for ticket in self.ticket_pattern.findall(text):
+            if ticket not in self.tickets:
+                self.tickets.append(ticket)
+                new_signal = True
+        if self.term_pattern is not None:
+            for term in self.term_pattern.findall(text):
+                if term.lower() not in (t.lower() for t in self.terms):
+                    self.terms.append(term)
+        for sentence in _SENTENCES.split(text):
+            sentence = sentence.strip()
+            if sentence and BLOCKER_PATTERN.search(sentence) and sentence not in self.blockers:
+                self.blockers.append(sentence)
+                new_signal = True
+        return new_signal
+
+    def _flush(self):
+        """Send the pending delta to the model in the background (lock held)."""
+        delta = "\n".join(self._pending)
+        self._pending = []
+        self._pending_chars = 0
+        self._new_signal = False
+        self.stats['delta_analyses'] += 1
+        self._partials.append(self._executor.submit(self._analyze_delta, delta, len(self._partials)))
+
+    def add_segment(self, text: str) -> Dict[str, Any]:
+        """Clean, match and (maybe) schedule analysis of one transcript segment."""
+        cleaned, stats = preprocess_transcript(text, self.ticket_prefixes)
+        with self._lock:
+            if self.finished:
+                raise ValueError(f"Live session {self.session_id} is already finished")
+            self.last_active = time.monotonic()
+            self.stats['segments'] += 1
+            self.stats['original_chars'] += stats['original_chars']
+            self.stats['processed_chars'] += stats['processed_chars']
+
+            if cleaned:
+                self.segments.append(cleaned)
+                self._pending.append(cleaned)
+                self._pending_chars += len(cleaned)
+                self._new_signal |= self._match(cleaned)
+
+            analyzing = (
+                self._pending_chars >= self.max_delta_chars
+                or (self._new_signal and self._pending_chars >= self.min_delta_chars)
+            )
+            if analyzing:
+                self._flush()
+            return self.snapshot(analysis_scheduled=analyzing)
+
+    def snapshot(self, analysis_scheduled: bool = False) -> Dict[str, Any]:
+        return {
+            "session_id": self.session_id,
+            "segments": self.stats['segments'],
+            "tickets": list(self.tickets),
+            "terms": list(self.terms),
+            "blockers": list(self.blockers),
+            "analysis_scheduled": analysis_scheduled,
+            "delta_analyses": self.stats['delta_analyses'],
+            "pending_chars": self._pending_chars
+        }
+
+    def close(self) -> List[Future]:
+        """
+        Stop accepting segments and schedule the last delta.
+
+        Returns:
+            Futures of every delta analysis, in transcript order
+        """
+        with self._lock:
+            if self.finished:
+                raise ValueError(f"Live session {self.session_id} is already finished")
+            self.finished = True
+            if self._pending:
+                self._flush()
+            return list(self._partials)
+
+    def finish(self, timeout: float = None) -> List[Dict[str, Any]]:
+        """
+        Analyze what's left and wait for every delta analysis.
+
+        Args:
+            timeout: Overall deadline for all delta analyses, in seconds
+
+        Returns:
+            Partial analyses in transcript order (failed or late deltas are skipped)
+
+        Raises:
+            RuntimeError: If every delta analysis failed
+        """
+        futures = self.close()
+        done, _ = wait(futures, timeout=timeout)
+        partials, errors = [], []
+        for future in futures:
+            if future not in done:
+                future.cancel()
+                errors.append("timed out")
+            elif future.exception() is not None:
+                errors.append(str(future.exception()))
+            else:
+                partials.append(future.result())
+        if futures and not partials:
+            raise RuntimeError(f"All {len(futures)} delta analyses failed: {errors[0]}")
+        return partials
+
+    @property
+    def transcript(self) -> str:
+        return "\n".join(self.segments)
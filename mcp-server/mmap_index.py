@@ -0,0 +1,139 @@
+"""
+Memory-Mapped Key/Value Index
+Read-only on-disk index for glossary terms and tickets.
+
+Each MCP server process used to json.load() its own copy of the corpora.
+An index file is instead opened with mmap: opening is O(1), lookups binary
+search the fixed-size entry table and decode only the matching value, and
+every worker on the host shares the same page-cached bytes.
+
+File layout (little endian):
+
+    header   magic b'OCIX' | version u16 | reserved u16 | count u32 | strings_offset u64 |
+             source_mtime_ns u64 | source_size u64
+    entries  count x (key_off u32, key_len u32, val_off u32, val_len u32),
+             sorted by key bytes; offsets are relative to strings_offset
+    strings  UTF-8 keys and JSON-encoded values
+
+The source signature is the (mtime_ns, size) of the data file the index was
+built from. Callers rebuild on any mismatch, not only when the source looks
+newer: a deploy that preserves an older mtime (rsync -a, cp -p) still
+changes the signature.
+"""
+
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+MAGIC = b'OCIX'
+VERSION = 2
+_HEADER = struct.Struct('<4sHHIQQQ')
+_ENTRY = struct.Struct('<IIII')
+
+
+def build_index(path: Path, items: Iterable[Tuple[str, Any]],
+                normalize: Callable[[str], str] = lambda key: key,
+                source_signature: Tuple[int, int] = (0, 0)):
+    """
+    Write an index file atomically (temp file + rename).
+
+    Args:
+        path: Destination file
+        items: (key, value) pairs; values must be JSON serializable
+        normalize: Applied to keys at build time (and must be applied to
+            lookup keys the same way, see MmapIndex)
+        source_signature: (mtime_ns, size) of the source file, stored in the header
+    """
+    records = sorted(
+        (normalize(key).encode('utf-8'), json.dumps(value, separators=(',', ':')).encode('utf-8'))
+        for key, value in items
+    )
+
+    entries = bytearray()
+    strings = bytearray()
+    for key, value in records:
+        key_off = len(strings)
+        strings += key
+        val_off = len(strings)
+        strings += value
+        entries += _ENTRY.pack(key_off, len(key), val_off, len(value))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, 0, len(records), _HEADER.size + len(entries), *source_signature))
+        f.write(entries)
+        f.write(strings)
+    os.replace(tmp, path)
+
+
+class MmapIndex:
+    """Read-only view over an index file written by ``build_index``."""
+
+    def __init__(self, path: Path, normalize: Callable[[str], str] = lambda key: key):
+        self.path = Path(path)
+        self.normalize = normalize
+        with open(self.path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mm) < _HEADER.size:
+            self._mm.close()
+            raise ValueError(f"{self.path} is not a version {VERSION} index file")
+        magic, version, _, self._count, self._strings, mtime_ns, size = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"{self.path} is not a version {VERSION} index file")
+        self.source_signature = (mtime_ns, size)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: str) -> bool:
+        return self._find(key) is not None
+
+    def _entry(self, i: int) -> Tuple[int, int, int, int]:
+        return _ENTRY.unpack_from(self._mm, _HEADER.size + i * _ENTRY.size)
+
+    def _key_at(self, i: int) -> bytes:
+        key_off, key_len, _, _ = self._entry(i)
+        start = self._strings + key_off
+        return self._mm[start:start + key_len]
+
+    def _find(self, key: str) -> Optional[int]:
+        target = self.normalize(key).encode('utf-8')
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count and self._key_at(lo) == target:
+            return lo
+        return None
+
+    def _value_at(self, i: int) -> Any:
+        _, _, val_off, val_len = self._entry(i)
+        start = self._strings + val_off
+        return json.loads(self._mm[start:start + val_len])
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Value for ``key`` (normalized the same way as at build time)."""
+        i = self._find(key)
+        return default if i is None else self._value_at(i)
+
+    def keys(self) -> Iterator[str]:
+        """Normalized keys in sorted order."""
+        for i in range(self._count):
+            yield self._key_at(i).decode('utf-8')
+
+    def values(self) -> Iterator[Any]:
+        for i in range(self._count):
+            yield self._value_at(i)
+
+    def close(self):
+        self._mm.close()
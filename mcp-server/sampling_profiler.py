@@ -0,0 +1,204 @@
+"""
+Sampling Profiler
+Low-overhead, on-demand CPU profiling for the running MCP server.
+
+A daemon thread wakes every ``interval`` seconds and records the Python
+stack of every other thread (``sys._current_frames()``). Stacks are stored
+in collapsed form (``frame;frame;frame count``), which flamegraph.pl,
+speedscope and inferno all read directly.
+
+Nothing is installed until a profile is started: no tracing hooks, no
+wrappers. ``watch_calls()`` wraps an async tool-call coroutine only while a
+"next N calls" profile is armed and is removed again when it finishes.
+"""
+
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Leaf frames of threads that are parked, not burning CPU
+_IDLE_MODULES = ('selectors.py', 'threading.py', 'queue.py', 'thread.py', 'base_events.py')
+
+
+def _frame_label(frame) -> str:
+    return f"{Path(frame.f_code.co_filename).stem}:{frame.f_code.co_name}"
+
+
+class Profile:
+    """One profiling run: a time window or the next N tool calls."""
+
+    def __init__(self, interval: float, duration: Optional[float], tool_calls: Optional[int],
+                 max_seconds: float, only_during_calls: bool):
+        self.profile_id = uuid.uuid4().hex[:12]
+        self.interval = interval
+        self.duration = duration
+        self.tool_calls = tool_calls
+        self.max_seconds = max_seconds
+        self.only_during_calls = only_during_calls
+
+        # Guards stacks/samples: the sampler thread writes while get_profile reads
+        self._lock = threading.Lock()
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.idle_samples = 0
+        self.calls_seen = 0
+        self.calls_in_flight = 0
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.stop_reason: Optional[str] = None
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._sample_loop, name=f"profiler-{self.profile_id}",
+                                        daemon=True)
+
+    @property
+    def running(self) -> bool:
+        return not self._done.is_set()
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self, reason: str):
+        if self.running:
+            self.stop_reason = reason
+            self.finished_at = time.time()
+            self._done.set()
+
+    def _sample_loop(self):
+        me = threading.get_ident()
+        names = {}
+        deadline = time.monotonic() + min(self.duration or self.max_seconds, self.max_seconds)
+        while not self._done.wait(self.interval):
+            if time.monotonic() >= deadline:
+                self.stop("duration reached" if self.duration else "max_seconds reached")
+                break
+            if self.only_during_calls and self.calls_in_flight == 0:
+                continue
+
+            collected, idle = [], 0
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                if Path(frame.f_code.co_filename).name in _IDLE_MODULES:
+                    idle += 1
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                if thread_id not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stack.append(names.get(thread_id, str(thread_id)))
+                collected.append(';'.join(reversed(stack)))
+            with self._lock:
+                self.stacks.update(collected)
+                self.samples += len(collected)
+                self.idle_samples += idle
+
+    def _snapshot(self):
+        """Copy of the stack counts and sample total, safe while sampling."""
+        with self._lock:
+            return Counter(self.stacks), self.samples
+
+    def collapsed(self) -> str:
+        """Collapsed-stack text, one ``stack count`` line per unique stack."""
+        stacks, _ = self._snapshot()
+        return "\n".join(f"{stack} {count}" for stack, count in stacks.most_common())
+
+    def top_functions(self, limit: int = 15) -> List[Dict[str, Any]]:
+        """Functions by self samples (leaf frame) and total samples (anywhere on the stack)."""
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        stacks, samples = self._snapshot()
+        for stack, count in stacks.items():
+            frames = stack.split(';')[1:]
+            if not frames:
+                continue
+            self_counts[frames[-1]] += count
+            for frame in set(frames):
+                total_counts[frame] += count
+        return [
+            {"function": frame, "self_samples": count, "total_samples": total_counts[frame],
+             "self_pct": round(100 * count / samples, 1) if samples else 0.0}
+            for frame, count in self_counts.most_common(limit)
+        ]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "profile_id": self.profile_id,
+            "status": "running" if self.running else "finished",
+            "stop_reason": self.stop_reason,
+            "interval_ms": round(self.interval * 1000, 2),
+            "samples": self.samples,
+            "idle_samples": self.idle_samples,
+            "tool_calls_profiled": self.calls_seen,
+            "elapsed_seconds": round((self.finished_at or time.time()) - self.started_at, 2)
+        }
+
+
+class ProfilerController:
+    """Runs at most one profile at a time and keeps the recent results."""
+
+    def __init__(self, output_dir: Path, keep: int = 10):
+        self.output_dir = Path(output_dir)
+        self.keep = keep
+        self.active: Optional[Profile] = None
+        self.results: Dict[str, Profile] = {}
+        self._lock = threading.Lock()
+
+    def start(self, interval: float, duration: Optional[float] = None, tool_calls: Optional[int] = None,
+              max_seconds: float = 60) -> Profile:
+        with self._lock:
+            if self.active is not None and self.active.running:
+                raise RuntimeError(f"Profile {self.active.profile_id} is already running")
+            profile = Profile(interval, duration, tool_calls, max_seconds, only_during_calls=bool(tool_calls))
+            self.active = profile
+            self.results[profile.profile_id] = profile
+            while len(self.results) > self.keep:
+                self.results.pop(next(iter(self.results)))
+        profile.start()
+        return profile
+
+    def get(self, profile_id: str) -> Profile:
+        profile = self.results.get(profile_id)
+        if profile is None:
+            raise KeyError(f"Unknown profile: {profile_id}")
+        return profile
+
+    def write_artifact(self, profile: Profile) -> Path:
+        """Write the collapsed stacks to ``<output_dir>/<profile_id>.folded``."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.output_dir / f"{profile.profile_id}.folded"
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(profile.collapsed() + "\n", encoding='utf-8')
+        os.replace(tmp, path)
+        return path
+
+    def watch_calls(self, owner, attribute: str, profile: Profile, ignore=()):
+        """
+        Count tool calls made through ``owner.<attribute>`` (an async method)
+        until ``profile.tool_calls`` have finished, then unhook.
+        """
+        original = getattr(owner, attribute)
+
+        async def counted(name, *args, **kwargs):
+            if not profile.running and getattr(owner, attribute, None) is counted:
+                delattr(owner, attribute)  # stopped by its time limit
+            if name in ignore or not profile.running:
+                return await original(name, *args, **kwargs)
+            profile.calls_in_flight += 1
+            try:
+                return await original(name, *args, **kwargs)
+            finally:
+                profile.calls_in_flight -= 1
+                profile.calls_seen += 1
+                if profile.calls_seen >= profile.tool_calls:
+                    profile.stop(f"{profile.tool_calls} tool calls profiled")
+                if not profile.running and getattr(owner, attribute, None) is counted:
+                    delattr(owner, attribute)
+
+        setattr(owner, attribute, counted)
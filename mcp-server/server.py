@@ -6,29 +6,206 @@ This implements the actual MCP protocol with Bedrock Agent orchestration.
 """
 
 import os
+import re
+import argparse
+import asyncio
+import codecs
+import sys
 import json
-import boto3
+import time
+import hashlib
+import hmac
+import threading
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError, ReadTimeoutError
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 from mcp.server.fastmcp import FastMCP
 
+from aws_clients import MAX_POOL_CONNECTIONS, make_client, client_metrics
+from data_cache import load_json
+from standup_analytics import StandupAnalytics
+from singleflight import single_flight, singleflight_metrics
+from compliance_index import ComplianceIndex
+from mmap_index import MmapIndex, build_index
+from shared_cache import create_cache
+from context_bundle import ContextBundleScheduler
+from live_session import LiveStandupSession
+from token_budget import Section, allocate, estimate_tokens, output_tokens_for, truncate_to_tokens
+from transcript_preprocessor import known_ticket_prefixes, preprocess_transcript
+
 # Initialize FastMCP server
 mcp = FastMCP("onboarding-copilot")
 
-# AWS Bedrock client
-bedrock_runtime = boto3.client(
+# AWS Bedrock client (long read timeout - model calls can take a while)
+bedrock_runtime = make_client(
     'bedrock-runtime',
-    region_name=os.getenv('AWS_REGION', 'us-east-1')
+    read_timeout=float(os.getenv('BEDROCK_READ_TIMEOUT', '120'))
 )
 
 # S3 client
-s3_client = boto3.client('s3', region_name=os.getenv('AWS_REGION', 'us-east-1'))
+s3_client = make_client('s3')
 BUCKET_NAME = os.getenv('S3_BUCKET_NAME', 'onboarding-copilot-docs')
+# Docs larger than this are truncated instead of being read into memory whole
+DOC_MAX_BYTES = int(os.getenv('DOC_MAX_BYTES', str(1024 * 1024)))
+
+# Bedrock analyses can block a thread for minutes (long read timeout plus
+# adaptive retries). They get their own pool, sized like the client's
+# connection pool, so they never starve the default executor that short
+# blocking steps (docs, compliance, saving) run in.
+BEDROCK_MAX_CONCURRENCY = int(os.getenv('BEDROCK_MAX_CONCURRENCY', str(MAX_POOL_CONNECTIONS)))
+_bedrock_executor = ThreadPoolExecutor(max_workers=BEDROCK_MAX_CONCURRENCY, thread_name_prefix='bedrock')
+
+# Coalescing groups for identical concurrent tool calls
+_docs_flight = single_flight('get_docs')
+_analysis_flight = single_flight('standup_analysis', executor=_bedrock_executor)
+
+# Result cache; CACHE_BACKEND=sqlite shares it between HTTP worker processes
+cache = create_cache()
+ANALYSIS_CACHE_TTL = float(os.getenv('ANALYSIS_CACHE_TTL_SECONDS', '900'))
+
+# Optional process pool for CPU-heavy steps (regex preprocessing, chunking of
+# long transcripts) so they don't hold the GIL while other requests wait on I/O
+CPU_WORKERS = int(os.getenv('CPU_WORKERS', '0'))
+CPU_OFFLOAD_MIN_CHARS = int(os.getenv('CPU_OFFLOAD_MIN_CHARS', '20000'))
+_cpu_pool = None
+_cpu_pool_lock = threading.Lock()
+
+
+def _cpu_executor(size: int):
+    """The CPU process pool, or None to run inline (pool disabled or input small)."""
+    global _cpu_pool
+    if CPU_WORKERS <= 0 or size < CPU_OFFLOAD_MIN_CHARS:
+        return None
+    if _cpu_pool is None:
+        with _cpu_pool_lock:
+            if _cpu_pool is None:
+                # multiprocessing is slow to import; only pay for it when used
+                from concurrent.futures import ProcessPoolExecutor
+                _cpu_pool = ProcessPoolExecutor(max_workers=CPU_WORKERS)
+    return _cpu_pool
+
+
+def run_cpu_bound(fn, *args, size: int = 0):
+    """
+    Run ``fn(*args)`` in the CPU process pool if enabled and the input is large.
+    
+    Blocks until done: only call this from worker threads. Async tools
+    use run_cpu_bound_async() so the event loop keeps serving requests.
+    """
+    pool = _cpu_executor(size)
+    if pool is None:
+        return fn(*args)
+    return pool.submit(fn, *args).result()
+
+
+async def run_cpu_bound_async(fn, *args, size: int = 0):
+    """Awaitable run_cpu_bound() for async tools."""
+    pool = _cpu_executor(size)
+    if pool is None:
+        return fn(*args)
+    return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
 
 # Data directory
 DATA_DIR = Path(__file__).parent.parent / 'data'
 
+# Parsed JSON reference data is pickled here so new server processes skip
+# JSON parsing; DATA_CACHE_DIR=off keeps the cache in memory only. The
+# default is per user: pickles are only loaded from a private directory.
+_data_cache_setting = os.getenv('DATA_CACHE_DIR', str(
+    Path(os.getenv('XDG_CACHE_HOME', str(Path.home() / '.cache'))) / 'onboarding-copilot' / 'parsed'
+))
+DATA_CACHE_DIR = None if _data_cache_setting.lower() in ('', 'off', 'none') else Path(_data_cache_setting)
+
+
+def load_reference_json(filename: str) -> Any:
+    """Parsed data file from DATA_DIR (shared, read-only)."""
+    return load_json(DATA_DIR / filename, DATA_CACHE_DIR)
+
+# Local copies of saved summaries
+SUMMARY_DIR = Path(os.getenv('SUMMARY_DIR', str(DATA_DIR)))
+
+# Per-user compliance progress (append-only log, see compliance_index.py)
+COMPLIANCE_PROGRESS_FILE = Path(os.getenv(
+    'COMPLIANCE_PROGRESS_FILE', str(DATA_DIR / 'compliance_progress.log')
+))
+
+_compliance = None
+_compliance_lock = threading.Lock()
+
+
+def _compliance_index() -> ComplianceIndex:
+    """Build the compliance index on first use and reuse it afterwards."""
+    global _compliance
+    if _compliance is None:
+        with _compliance_lock:
+            if _compliance is None:
+                _compliance = ComplianceIndex(
+                    DATA_DIR / 'compliance_requirements.json',
+                    COMPLIANCE_PROGRESS_FILE
+                )
+    return _compliance
+
+# Memory-mapped lookup indexes, built from the data files on first use and
+# shared (via the page cache) by every server process on the host
+INDEX_DIR = Path(os.getenv('INDEX_DIR', str(DATA_DIR / 'indexes')))
+INDEX_SOURCES = {
+    'tickets': (
+        'sample_jira_tickets.json',
+        lambda data: ((t['id'], t) for t in data),
+        lambda key: key.strip().upper()
+    ),
+    'glossary': (
+        'team_glossary.json',
+        lambda data: ((term, {"term": term, "definition": d}) for term, d in data.items()),
+        lambda key: key.strip().lower()
+    )
+}
+
+# Standup analytics rollups. The event log is derived from the saved
+# summaries and can be rebuilt with recompute_standup_analytics.
+ANALYTICS_EVENTS_FILE = Path(os.getenv('ANALYTICS_EVENTS_FILE', str(INDEX_DIR / 'standup_events.log')))
+ANALYTICS_PARQUET_PATH = Path(os.getenv('ANALYTICS_PARQUET_PATH', str(INDEX_DIR / 'standup_rollup_rows.parquet')))
+analytics = StandupAnalytics(ANALYTICS_EVENTS_FILE)
+
+_indexes: Dict[str, Any] = {}
+_indexes_lock = threading.Lock()
+
+
+def _lookup_index(name: str) -> MmapIndex:
+    """Open (building or rebuilding if the source changed) a lookup index."""
+    filename, to_items, normalize = INDEX_SOURCES[name]
+    st = (DATA_DIR / filename).stat()
+    signature = (st.st_mtime_ns, st.st_size)
+    
+    cached = _indexes.get(name)
+    if cached and cached.source_signature == signature:
+        return cached
+    
+    with _indexes_lock:
+        cached = _indexes.get(name)
+        if cached and cached.source_signature == signature:
+            return cached
+        
+        # Any signature change rebuilds, so a data file deployed with an
+        # older mtime (rsync -a, cp -p) is still picked up
+        index_path = INDEX_DIR / f'{name}.idx'
+        try:
+            index = MmapIndex(index_path, normalize)
+        except (OSError, ValueError):
+            index = None  # missing, or written by an older version
+        if index is None or index.source_signature != signature:
+            if index is not None:
+                index.close()
+            build_index(index_path, to_items(load_reference_json(filename)), normalize, signature)
+            index = MmapIndex(index_path, normalize)
+        
+        _indexes[name] = index
+        if cached is not None:
+            cached.close()  # the rebuilt file is a new inode; drop the old mapping
+        return index
+
 
 # ============================================================================
 # MCP TOOLS - These are exposed to the Bedrock Agent
@@ -43,9 +220,7 @@ def get_tickets() -> Dict[str, Any]:
     priorities, and estimated hours.
     """
     try:
-        file_path = DATA_DIR / 'sample_jira_tickets.json'
-        with open(file_path, 'r', encoding='utf-8') as f:
-            tickets = json.load(f)
+        tickets = load_reference_json('sample_jira_tickets.json')
         
         return {
             "success": True,
@@ -57,7 +232,7 @@ def get_tickets() -> Dict[str, Any]:
 
 
 @mcp.tool()
-def get_docs(doc_name: str = "architecture_overview.md") -> Dict[str, Any]:
+async def get_docs(doc_name: str = "architecture_overview.md") -> Dict[str, Any]:
     """
     Get documentation from S3 or local storage.
     
@@ -66,6 +241,50 @@ def get_docs(doc_name: str = "architecture_overview.md") -> Dict[str, Any]:
     
     Returns documentation content in markdown format.
     """
+    # The fetch runs off the event loop, so concurrent requests for the same
+    # doc overlap and share one S3 fetch
+    return await _docs_flight.do_async(doc_name, _load_doc, doc_name)
+
+
+def get_docs_sync(doc_name: str) -> Dict[str, Any]:
+    """Blocking get_docs() for code that already runs in a worker thread."""
+    return _docs_flight.do(doc_name, _load_doc, doc_name)
+
+
+def read_s3_text(body, max_bytes: int = None, chunk_size: int = 64 * 1024):
+    """
+    Read an S3 StreamingBody as text, chunk by chunk.
+    
+    Decodes incrementally instead of holding the raw bytes and the decoded
+    str at the same time, and stops after ``max_bytes``.
+    
+    Returns:
+        Tuple of (text, truncated)
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    parts = []
+    total = 0
+    truncated = False
+    try:
+        for chunk in body.iter_chunks(chunk_size):
+            if max_bytes is not None and total + len(chunk) > max_bytes:
+                chunk = chunk[:max_bytes - total]
+                truncated = True
+            total += len(chunk)
+            parts.append(decoder.decode(chunk))
+            if truncated:
+                break
+        parts.append(decoder.decode(b'', final=not truncated))
+    finally:
+        body.close()
+    return ''.join(parts), truncated
+
+
+def _load_doc(doc_name: str) -> Dict[str, Any]:
+    cached = cache.get(f'doc:{doc_name}')
+    if cached is not None:
+        return cached
+    
     try:
         # Try S3 first
         try:
@@ -73,21 +292,73 @@ def get_docs(doc_name: str = "architecture_overview.md") -> Dict[str, Any]:
                 Bucket=BUCKET_NAME,
                 Key=f'docs/{doc_name}'
             )
-            content = response['Body'].read().decode('utf-8')
+            content, truncated = read_s3_text(response['Body'], max_bytes=DOC_MAX_BYTES)
             source = "S3"
         except:
             # Fallback to local
             file_path = DATA_DIR / doc_name
             with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+                content = f.read(DOC_MAX_BYTES)
+                truncated = bool(f.read(1))
             source = "local"
         
-        return {
+        result = {
             "success": True,
             "content": content,
             "doc_name": doc_name,
+            "truncated": truncated,
             "source": source
         }
+        cache.set(f'doc:{doc_name}', result)
+        return result
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+@mcp.tool()
+def lookup_ticket(ticket_id: str) -> Dict[str, Any]:
+    """
+    Look up a single Jira ticket by ID (e.g. "BE-101").
+    
+    Args:
+        ticket_id: Ticket identifier, case-insensitive
+    """
+    try:
+        ticket = _lookup_index('tickets').get(ticket_id)
+        if ticket is None:
+            return {"success": False, "error": f"Ticket not found: {ticket_id}"}
+        
+        return {"success": True, "ticket": ticket}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+@mcp.tool()
+def explain_terms(terms: List[str]) -> Dict[str, Any]:
+    """
+    Look up definitions for specific glossary terms.
+    
+    Args:
+        terms: Terms to explain, case-insensitive (e.g. ["Lambda", "jwt"])
+    
+    Returns definitions for known terms and lists the unknown ones.
+    """
+    try:
+        index = _lookup_index('glossary')
+        explanations = {}
+        unknown = []
+        for term in terms:
+            entry = index.get(term)
+            if entry is None:
+                unknown.append(term)
+            else:
+                explanations[entry['term']] = entry['definition']
+        
+        return {
+            "success": True,
+            "explanations": explanations,
+            "unknown_terms": unknown
+        }
     except Exception as e:
         return {"success": False, "error": str(e)}
 
@@ -121,49 +392,118 @@ def get_glossary() -> Dict[str, Any]:
     }
 
 
+def summary_idempotency_key(summary: Dict[str, Any], user_id: str) -> str:
+    """Content hash used as the idempotency key when the caller gives none."""
+    canonical = json.dumps({"user_id": user_id, "summary": summary}, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def summary_id_for(key: str, user_id: str) -> str:
+    """
+    Summary ID, scoped by user (same scheme as the Lambda common layer's
+    summary_ids.py). The sanitized user prefix can collide ("a/b", "a_b"),
+    so the hash covers the raw user ID together with the key.
+    """
+    safe_user = re.sub(r'[^A-Za-z0-9._-]', '_', str(user_id))
+    digest = hashlib.sha256(json.dumps([str(user_id), key]).encode('utf-8')).hexdigest()
+    return f"{safe_user}_{digest[:20]}"
+
+
+def _s3_marker(local_file: Path) -> Path:
+    """Written next to a local summary once S3 has confirmed the upload."""
+    return local_file.with_suffix('.s3')
+
+
+def _upload_summary(summary_id: str, body: str, local_file: Path) -> Tuple[bool, bool]:
+    """
+    Conditionally put a summary into S3 unless its upload is already confirmed.
+    
+    Returns:
+        Tuple of (saved in S3, object already existed)
+    """
+    marker = _s3_marker(local_file)
+    if marker.exists():
+        return True, True
+    try:
+        s3_client.put_object(
+            Bucket=BUCKET_NAME,
+            Key=f'summaries/{summary_id}.json',
+            Body=body,
+            ContentType='application/json',
+            IfNoneMatch='*'
+        )
+        duplicate = False
+    except ClientError as e:
+        code = e.response.get('Error', {}).get('Code', '')
+        if code not in ('PreconditionFailed', 'ConditionalRequestConflict'):
+            print(f"⚠️  S3 upload of {summary_id} failed ({code}); a retry will upload it", file=sys.stderr)
+            return False, False
+        duplicate = True
+    except Exception as e:
+        print(f"⚠️  S3 upload of {summary_id} failed ({e}); a retry will upload it", file=sys.stderr)
+        return False, False
+    marker.touch()
+    return True, duplicate
+
+
 @mcp.tool()
-def write_summary(summary: Dict[str, Any], user_id: str = "new_joiner") -> Dict[str, Any]:
+def write_summary(summary: Dict[str, Any], user_id: str = "new_joiner",
+                  idempotency_key: str = None) -> Dict[str, Any]:
     """
     Save the generated standup summary and action plan.
     
     Args:
         summary: The complete summary with analysis and recommendations
         user_id: Identifier for the user
+        idempotency_key: Optional key identifying this write; retries with
+            the same key (or, without one, the same content) return the
+            existing summary instead of writing a duplicate
     
-    Saves to both local JSON and S3 for persistence.
+    Saves to both local JSON and S3 for persistence. A retry of a write
+    whose S3 upload failed uploads the stored summary again.
     """
     try:
-        timestamp = datetime.now().isoformat()
-        summary_id = f"summary_{int(datetime.now().timestamp() * 1000)}"
+        key = idempotency_key or summary_idempotency_key(summary, user_id)
+        summary_id = summary_id_for(key, user_id)
+        local_file = SUMMARY_DIR / f'summary_{summary_id}.json'
         
-        # Add metadata
-        full_summary = {
-            "id": summary_id,
-            "user_id": user_id,
-            "timestamp": timestamp,
-            **summary
-        }
+        # The local summary files double as the idempotency index
+        duplicate_local = local_file.exists()
+        if not duplicate_local:
+            # Add metadata
+            full_summary = {
+                "id": summary_id,
+                "user_id": user_id,
+                "timestamp": datetime.now().isoformat(),
+                "idempotency_key": key,
+                **summary
+            }
+            body = json.dumps(full_summary, indent=2)
+            
+            # Save locally; exclusive create so concurrent retries can't both write
+            try:
+                with open(local_file, 'x', encoding='utf-8') as f:
+                    f.write(body)
+            except FileExistsError:
+                duplicate_local = True
+            else:
+                # Update the rollups; analytics must never fail the write itself
+                try:
+                    analytics.record(full_summary)
+                except Exception as e:
+                    print(f"⚠️  Analytics rollup update failed for {summary_id}: {e}", file=sys.stderr)
         
-        # Save locally
-        local_file = DATA_DIR / f'{summary_id}.json'
-        with open(local_file, 'w', encoding='utf-8') as f:
-            json.dump(full_summary, f, indent=2)
+        if duplicate_local:
+            # Upload what was stored the first time, not this call's content
+            body = local_file.read_text(encoding='utf-8')
         
-        # Save to S3
-        try:
-            s3_client.put_object(
-                Bucket=BUCKET_NAME,
-                Key=f'summaries/{summary_id}.json',
-                Body=json.dumps(full_summary, indent=2),
-                ContentType='application/json'
-            )
-            s3_saved = True
-        except:
-            s3_saved = False
+        # Save to S3 - only if no object with this ID exists yet
+        s3_saved, s3_duplicate = _upload_summary(summary_id, body, local_file)
         
         return {
             "success": True,
             "summary_id": summary_id,
+            "duplicate": duplicate_local or s3_duplicate,
             "saved_locally": True,
             "saved_s3": s3_saved,
             "path": str(local_file)
@@ -172,6 +512,41 @@ def write_summary(summary: Dict[str, Any], user_id: str = "new_joiner") -> Dict[
         return {"success": False, "error": str(e)}
 
 
+@mcp.tool()
+def get_standup_insights(days: int = 14, top_n: int = 10) -> Dict[str, Any]:
+    """
+    Get trends across saved standup summaries.
+    
+    Args:
+        days: Size of the window, ending today
+        top_n: Entries per list
+    
+    Returns the most frequent tickets, glossary terms, blockers and users
+    over the window, plus standups per day.
+    """
+    try:
+        return {"success": True, **analytics.insights(days=max(1, days), top_n=max(1, top_n))}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+@mcp.tool()
+def recompute_standup_analytics(export_parquet: bool = False) -> Dict[str, Any]:
+    """
+    Rebuild the standup rollups from every saved summary file.
+    
+    Args:
+        export_parquet: Also write the flattened rows as Parquet
+            (needs pandas and pyarrow)
+    """
+    try:
+        started = time.perf_counter()
+        result = analytics.recompute(SUMMARY_DIR, ANALYTICS_PARQUET_PATH if export_parquet else None)
+        return {"success": True, **result, "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
 @mcp.tool()
 def get_compliance_requirements() -> Dict[str, Any]:
     """
@@ -180,48 +555,155 @@ def get_compliance_requirements() -> Dict[str, Any]:
     Returns list of compliance items that new joiners must complete.
     """
     try:
-        file_path = DATA_DIR / 'compliance_requirements.json'
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        index = _compliance_index()
         
         return {
             "success": True,
-            "framework": data.get('framework', 'SOC2'),
-            "requirements": data.get('requirements', []),
-            "count": len(data.get('requirements', []))
+            "framework": index.framework,
+            "requirements": index.requirements,
+            "count": len(index.requirements)
         }
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
-# ============================================================================
-# BEDROCK AGENT INTEGRATION
-# ============================================================================
+@mcp.tool()
+def get_pending_compliance(user_id: str = "new_joiner", mandatory_only: bool = False) -> Dict[str, Any]:
+    """
+    Get the compliance items a user still has to complete.
+    
+    Args:
+        user_id: Identifier for the user
+        mandatory_only: Only return mandatory requirements
+    
+    Returns pending items plus overall completion status.
+    """
+    try:
+        index = _compliance_index()
+        pending = index.pending(user_id, mandatory_only=mandatory_only)
+        
+        return {
+            "success": True,
+            "user_id": user_id,
+            "framework": index.framework,
+            "pending": pending,
+            "pending_count": len(pending),
+            "completed_count": len(index.completed(user_id)),
+            "compliant": index.is_compliant(user_id)
+        }
+    except Exception as e:
+        return {"success": False, "error": str(e)}
 
-def invoke_bedrock_agent(transcript: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
+
+@mcp.tool()
+def mark_compliance_complete(user_id: str, requirement_ids: List[str]) -> Dict[str, Any]:
     """
-    Invoke Bedrock Agent with the standup transcript.
+    Record that a user has completed one or more compliance items.
     
-    The agent will:
-    1. Analyze the transcript
-    2. Decide which MCP tools to call
-    3. Synthesize information
-    4. Generate beginner-friendly summary
+    Args:
+        user_id: Identifier for the user
+        requirement_ids: Requirement IDs to mark complete (e.g. ["SEC-001"])
+    """
+    try:
+        index = _compliance_index()
+        index.mark_complete(user_id, requirement_ids)
+        
+        return {
+            "success": True,
+            "user_id": user_id,
+            "completed": [r['id'] for r in index.completed(user_id)],
+            "pending_count": len(index.pending(user_id)),
+            "compliant": index.is_compliant(user_id)
+        }
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+@mcp.tool()
+def export_compliance_evidence(user_ids: List[str] = None) -> Dict[str, Any]:
+    """
+    Export compliance evidence for many users at once (audit packages).
     
     Args:
-        transcript: The standup audio transcription
-        context: Additional context (user info, etc.)
+        user_ids: Users to include; defaults to every user with recorded progress
+    """
+    try:
+        index = _compliance_index()
+        rows = index.export_evidence(user_ids)
+        
+        return {
+            "success": True,
+            "framework": index.framework,
+            "exported_at": datetime.now().isoformat(),
+            "users": rows,
+            "count": len(rows),
+            "compliant_count": sum(1 for row in rows if row['compliant'])
+        }
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+@mcp.tool()
+def get_server_metrics() -> Dict[str, Any]:
+    """
+    Get runtime metrics for this MCP server process.
     
-    Returns:
-        Complete analysis with summary and action plan
+    Returns AWS client pool utilization, retry counts and circuit breaker
+    state, per-model-tier latency, token usage and cost, prompt token
+    budget utilization, and how many identical concurrent calls were
+    coalesced.
     """
+    with _tier_stats_lock:
+        model_tiers = {tier: dict(stats) for tier, stats in MODEL_TIER_STATS.items()}
+        token_budget = dict(TOKEN_BUDGET_STATS)
+    token_budget['avg_utilization'] = (
+        round(token_budget['input_tokens_budgeted'] / token_budget['budget_total'], 3)
+        if token_budget['budget_total'] else 0.0
+    )
     
-    # Build the prompt for the agent
-    prompt = f"""You are an AI onboarding assistant helping a new engineer understand their team's standup.
+    return {
+        "success": True,
+        "aws_clients": client_metrics(),
+        "model_tiers": model_tiers,
+        "coalescing": singleflight_metrics(),
+        "cache": {"backend": cache.backend, **cache.stats},
+        "context_bundle": team_context.metrics(),
+        "token_budget": token_budget,
+        "process": {"pid": os.getpid(), "cpu_workers": CPU_WORKERS}
+    }
+
+
+# ============================================================================
+# BEDROCK AGENT INTEGRATION
+# ============================================================================
+
+# Transcripts longer than this are split into chunks and summarized map-reduce
+# style; shorter ones (typical standups) keep the single-call fast path.
+CHUNK_THRESHOLD_CHARS = int(os.getenv('TRANSCRIPT_CHUNK_THRESHOLD', '12000'))
+CHUNK_TARGET_CHARS = int(os.getenv('TRANSCRIPT_CHUNK_SIZE', '6000'))
+CHUNK_MAX_PARALLEL = int(os.getenv('TRANSCRIPT_CHUNK_PARALLELISM', '4'))
+
+# A new turn starts at a speaker label ("Speaker 1:", "Alice:") or a
+# timestamp marker ("[00:12:05]") at the beginning of a line.
+TURN_BOUNDARY = re.compile(
+    r'^(?=\s*(?:\[\d{1,2}:\d{2}(?::\d{2})?\]|(?:Speaker\s*\d+|[A-Z][\w.\- ]{0,30}):))',
+    re.MULTILINE
+)
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+ANALYSIS_SYSTEM_PROMPT = """You are an AI assistant with access to MCP tools. 
+                When you need information, explain that you're calling a tool, 
+                then provide the analysis. Format your response as JSON with:
+                {
+                  "summary": "beginner-friendly explanation",
+                  "relevant_tickets": ["ticket IDs"],
+                  "term_explanations": {"term": "explanation"},
+                  "focus_areas": ["what to work on"],
+                  "blockers": ["any issues mentioned"]
+                }"""
 
-STANDUP TRANSCRIPT:
-{transcript}
 
+ANALYSIS_INSTRUCTIONS = """
 YOUR TASK:
 1. Analyze the standup transcript
 2. Use available tools to gather context:
@@ -242,53 +724,411 @@ YOUR TASK:
 Be helpful, clear, and assume the new joiner is unfamiliar with the codebase.
 """
 
+# Fixed part of every analysis prompt: system prompt, instructions, headings
+PROMPT_OVERHEAD_TOKENS = estimate_tokens(ANALYSIS_SYSTEM_PROMPT) + estimate_tokens(ANALYSIS_INSTRUCTIONS) + 60
+
+
+# Model tiers: short, simple standups go to the fast/cheap model and long or
+# ticket-heavy ones to the strong model. Costs are USD per 1K tokens and are
+# only used for logging.
+MODEL_TIERS = {
+    'fast': {
+        'model_id': os.getenv('BEDROCK_FAST_MODEL_ID', 'us.anthropic.claude-3-5-haiku-20241022-v1:0'),
+        'input_cost_per_1k': float(os.getenv('BEDROCK_FAST_INPUT_COST', '0.0008')),
+        'output_cost_per_1k': float(os.getenv('BEDROCK_FAST_OUTPUT_COST', '0.004'))
+    },
+    'strong': {
+        'model_id': os.getenv('BEDROCK_STRONG_MODEL_ID', 'us.anthropic.claude-3-5-sonnet-20241022-v2:0'),
+        'input_cost_per_1k': float(os.getenv('BEDROCK_STRONG_INPUT_COST', '0.003')),
+        'output_cost_per_1k': float(os.getenv('BEDROCK_STRONG_OUTPUT_COST', '0.015'))
+    }
+}
+FAST_TIER_MAX_CHARS = int(os.getenv('FAST_TIER_MAX_CHARS', '3000'))
+FAST_TIER_MAX_TICKETS = int(os.getenv('FAST_TIER_MAX_TICKETS', '3'))
+
+# Words that signal a discussion the fast model tends to summarize poorly
+COMPLEXITY_KEYWORDS = re.compile(
+    r'\b(?:incident|outage|rollback|migration|architecture|security|compliance|root cause|postmortem)\b',
+    re.IGNORECASE
+)
+TICKET_ID_PATTERN = re.compile(r'\b[A-Z]{2,5}-\d{1,5}\b')
+
+# Errors worth retrying on the other tier rather than failing the request.
+# Connection failures and timeouts (EndpointConnectionError,
+# ConnectTimeoutError, ReadTimeoutError) always fall back.
+FALLBACK_ERROR_CODES = {
+    'ThrottlingException', 'ServiceUnavailableException', 'ModelNotReadyException',
+    'ModelTimeoutException', 'InternalServerException', 'ModelErrorException'
+}
+
+# Prompt token budget (see token_budget.py). The input budget is shared by
+# transcript > glossary > tickets > architecture excerpt, in that order.
+PROMPT_TOKEN_BUDGET = int(os.getenv('PROMPT_TOKEN_BUDGET', '6000'))
+DOC_EXCERPT_MAX_TOKENS = int(os.getenv('DOC_EXCERPT_MAX_TOKENS', '400'))
+OUTPUT_TOKENS_MIN = int(os.getenv('OUTPUT_TOKENS_MIN', '512'))
+OUTPUT_TOKENS_MAX = int(os.getenv('OUTPUT_TOKENS_MAX', '4000'))
+OUTPUT_TOKENS_RATIO = float(os.getenv('OUTPUT_TOKENS_RATIO', '0.35'))
+
+TOKEN_BUDGET_STATS = {"prompts": 0, "truncated_prompts": 0, "input_tokens_budgeted": 0,
+                      "budget_total": 0, "max_tokens_requested": 0, "max_tokens_retries": 0}
+
+
+def _output_budget(input_tokens: int) -> int:
+    return output_tokens_for(input_tokens, OUTPUT_TOKENS_RATIO, OUTPUT_TOKENS_MIN, OUTPUT_TOKENS_MAX)
+
+
+MODEL_TIER_STATS = {
+    tier: {"calls": 0, "errors": 0, "fallbacks": 0, "latency_ms": 0.0,
+           "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0}
+    for tier in MODEL_TIERS
+}
+_tier_stats_lock = threading.Lock()
+
+
+def select_model_tier(transcript: str, candidate_tickets: int = None) -> str:
+    """
+    Pick the model tier for a transcript.
+    
+    The strong tier is used when the transcript is long, mentions many
+    tickets, or touches topics such as incidents or architecture.
+    """
+    if candidate_tickets is None:
+        candidate_tickets = len(set(TICKET_ID_PATTERN.findall(transcript)))
+    
+    if len(transcript) > FAST_TIER_MAX_CHARS:
+        return 'strong'
+    if candidate_tickets > FAST_TIER_MAX_TICKETS:
+        return 'strong'
+    if len(COMPLEXITY_KEYWORDS.findall(transcript)) >= 2:
+        return 'strong'
+    return 'fast'
+
+
+def _record_tier_call(tier: str, latency_ms: float, usage: Dict[str, int], error: bool = False):
+    """Accumulate latency, token usage and estimated cost for a tier."""
+    config = MODEL_TIERS[tier]
+    input_tokens = usage.get('input_tokens', 0)
+    output_tokens = usage.get('output_tokens', 0)
+    cost = (input_tokens * config['input_cost_per_1k'] + output_tokens * config['output_cost_per_1k']) / 1000
+    
+    with _tier_stats_lock:
+        stats = MODEL_TIER_STATS[tier]
+        stats['calls'] += 1
+        stats['errors'] += int(error)
+        stats['latency_ms'] += latency_ms
+        stats['input_tokens'] += input_tokens
+        stats['output_tokens'] += output_tokens
+        stats['cost_usd'] += cost
+    
+    print(f"📊 Bedrock [{tier}] {config['model_id']}: {latency_ms:.0f} ms, "
+          f"{input_tokens} in / {output_tokens} out tokens, ${cost:.5f}"
+          f"{' (error)' if error else ''}", file=sys.stderr)
+
+
+def _call_claude(prompt: str, max_tokens: int = OUTPUT_TOKENS_MAX, tier: str = 'strong') -> str:
+    """
+    Send a single prompt to Claude on Bedrock and return the response text.
+    
+    Throttling, model errors, timeouts or connection failures on the
+    requested tier fall back to the other tier once before the error is
+    raised. A response cut off at ``max_tokens`` is retried once with
+    OUTPUT_TOKENS_MAX so callers never parse a truncated JSON object.
+    """
+    tiers = [tier] + [t for t in MODEL_TIERS if t != tier]
+    
+    for attempt, current_tier in enumerate(tiers):
+        started = time.perf_counter()
+        try:
+            response = bedrock_runtime.invoke_model(
+                modelId=MODEL_TIERS[current_tier]['model_id'],
+                contentType='application/json',
+                body=json.dumps({
+                    'anthropic_version': 'bedrock-2023-05-31',
+                    'max_tokens': max_tokens,
+                    'messages': [
+                        {
+                            'role': 'user',
+                            'content': prompt
+                        }
+                    ],
+                    'system': ANALYSIS_SYSTEM_PROMPT
+                })
+            )
+            response_body = json.loads(response['body'].read())
+        except (ClientError, BotoConnectionError, ReadTimeoutError) as e:
+            _record_tier_call(current_tier, (time.perf_counter() - started) * 1000, {}, error=True)
+            if isinstance(e, ClientError):
+                error_code = e.response.get('Error', {}).get('Code', '')
+                retry_other_tier = error_code in FALLBACK_ERROR_CODES
+            else:
+                error_code = type(e).__name__
+                retry_other_tier = True
+            if not retry_other_tier or attempt == len(tiers) - 1:
+                raise
+            with _tier_stats_lock:
+                MODEL_TIER_STATS[current_tier]['fallbacks'] += 1
+            print(f"↪️  {error_code} on {current_tier} tier, falling back to {tiers[attempt + 1]}",
+                  file=sys.stderr)
+            continue
+        
+        _record_tier_call(current_tier, (time.perf_counter() - started) * 1000,
+                          response_body.get('usage', {}))
+        if response_body.get('stop_reason') == 'max_tokens' and max_tokens < OUTPUT_TOKENS_MAX:
+            with _tier_stats_lock:
+                TOKEN_BUDGET_STATS['max_tokens_retries'] += 1
+            print(f"✂️  Response hit max_tokens={max_tokens} on {current_tier} tier, "
+                  f"retrying with {OUTPUT_TOKENS_MAX}", file=sys.stderr)
+            return _call_claude(prompt, max_tokens=OUTPUT_TOKENS_MAX, tier=current_tier)
+        return response_body['content'][0]['text']
+
+
+def _extract_analysis(content: str) -> Dict[str, Any]:
+    """Pull the JSON analysis object out of a model response."""
     try:
-        # Call Bedrock with Claude
-        response = bedrock_runtime.invoke_model(
-            modelId='us.anthropic.claude-3-5-sonnet-20241022-v2:0',
-            contentType='application/json',
-            body=json.dumps({
-                'anthropic_version': 'bedrock-2023-05-31',
-                'max_tokens': 4000,
-                'messages': [
-                    {
-                        'role': 'user',
-                        'content': prompt
-                    }
-                ],
-                'system': """You are an AI assistant with access to MCP tools. 
-                When you need information, explain that you're calling a tool, 
-                then provide the analysis. Format your response as JSON with:
-                {
-                  "summary": "beginner-friendly explanation",
-                  "relevant_tickets": ["ticket IDs"],
-                  "term_explanations": {"term": "explanation"},
-                  "focus_areas": ["what to work on"],
-                  "blockers": ["any issues mentioned"]
-                }"""
-            })
+        json_match = re.search(r'\{[\s\S]*\}', content)
+        if json_match:
+            return json.loads(json_match.group())
+    except ValueError:
+        pass
+    return {"summary": content}
+
+
+def split_transcript(transcript: str, max_chars: int = CHUNK_TARGET_CHARS) -> List[str]:
+    """
+    Split a transcript into chunks of at most ``max_chars`` characters.
+    
+    Chunks are packed from whole speaker turns / timestamp windows so a
+    single remark is never cut in half. A turn that is longer than
+    ``max_chars`` on its own is split on sentence boundaries.
+    """
+    turns = [t.strip() for t in TURN_BOUNDARY.split(transcript) if t.strip()]
+    if len(turns) <= 1:
+        # No speaker labels or timestamps - fall back to paragraphs
+        turns = [p.strip() for p in re.split(r'\n\s*\n', transcript) if p.strip()]
+    
+    pieces = []
+    for turn in turns:
+        if len(turn) <= max_chars:
+            pieces.append(turn)
+            continue
+        sentence_block = ''
+        for sentence in SENTENCE_BOUNDARY.split(turn):
+            if sentence_block and len(sentence_block) + len(sentence) + 1 > max_chars:
+                pieces.append(sentence_block)
+                sentence_block = ''
+            # A single run-on "sentence" is hard-wrapped as a last resort
+            while len(sentence) > max_chars:
+                pieces.append(sentence[:max_chars])
+                sentence = sentence[max_chars:]
+            sentence_block = f"{sentence_block} {sentence}".strip()
+        if sentence_block:
+            pieces.append(sentence_block)
+    
+    chunks = []
+    current = ''
+    for piece in pieces:
+        if current and len(current) + len(piece) + 1 > max_chars:
+            chunks.append(current)
+            current = ''
+        current = f"{current}\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _dedupe(items: List[str]) -> List[str]:
+    """Order-preserving, case-insensitive de-duplication."""
+    seen = set()
+    result = []
+    for item in items:
+        key = str(item).strip().lower()
+        if key and key not in seen:
+            seen.add(key)
+            result.append(item)
+    return result
+
+
+def merge_analyses(partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Reduce step: merge per-chunk analyses into one.
+    
+    Ticket IDs, focus areas and blockers are de-duplicated in order of first
+    mention; the first explanation seen for a term wins.
+    """
+    merged = {
+        "summary": "\n\n".join(p.get('summary', '') for p in partials if p.get('summary')),
+        "relevant_tickets": [],
+        "term_explanations": {},
+        "focus_areas": [],
+        "blockers": []
+    }
+    for partial in partials:
+        merged['relevant_tickets'].extend(
+            str(t).strip().upper() for t in partial.get('relevant_tickets', []) or []
         )
-        
-        # Parse response
-        response_body = json.loads(response['body'].read())
-        content = response_body['content'][0]['text']
-        
-        # Try to extract JSON from response
+        merged['focus_areas'].extend(partial.get('focus_areas', []) or [])
+        merged['blockers'].extend(partial.get('blockers', []) or [])
+        for term, explanation in (partial.get('term_explanations') or {}).items():
+            merged['term_explanations'].setdefault(term, explanation)
+    
+    for key in ('relevant_tickets', 'focus_areas', 'blockers'):
+        merged[key] = _dedupe(merged[key])
+    return merged
+
+
+def _summarize_chunk(chunk: str, index: int, total: int = None) -> Dict[str, Any]:
+    """Map step: analyze one chunk of a long (or still running) transcript."""
+    position = (f"This is part {index + 1} of {total} of a long meeting transcript." if total
+                else f"This is part {index + 1} of a meeting that is still in progress.")
+    prompt = f"""You are an AI onboarding assistant helping a new engineer understand their team's meeting.
+{position}
+
+TRANSCRIPT PART:
+{chunk}
+
+Summarize only this part. List every ticket ID mentioned, explain technical
+terms a new joiner may not know, and note any blockers or concerns raised.
+"""
+    return _extract_analysis(_call_claude(
+        prompt, max_tokens=_output_budget(estimate_tokens(chunk)), tier=select_model_tier(chunk)
+    ))
+
+
+def _summarize_long_transcript(transcript: str) -> Dict[str, Any]:
+    """Map-reduce analysis for transcripts above ``CHUNK_THRESHOLD_CHARS``."""
+    chunks = run_cpu_bound(split_transcript, transcript, size=len(transcript))
+    print(f"✂️  Long transcript split into {len(chunks)} chunks", file=sys.stderr)
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(CHUNK_MAX_PARALLEL, len(chunks)))) as pool:
+        partials = list(pool.map(
+            lambda args: _summarize_chunk(args[1], args[0], len(chunks)),
+            enumerate(chunks)
+        ))
+    
+    analysis = _reduce_partials(partials)
+    analysis['chunk_count'] = len(chunks)
+    return analysis
+
+
+def _reduce_partials(partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Reduce step: merge partial analyses and have the model combine the summaries."""
+    analysis = merge_analyses(partials)
+    if len(partials) < 2:
+        return analysis
+    
+    # Ask the model to turn the per-part summaries into one coherent story.
+    # The merged ticket/term/blocker lists are kept as-is either way.
+    reduce_prompt = f"""Combine these partial summaries of one meeting into a single
+beginner-friendly summary for a new engineer. Keep it concise.
+
+PARTIAL SUMMARIES:
+{analysis['summary']}
+
+TICKETS MENTIONED: {', '.join(analysis['relevant_tickets']) or 'none'}
+BLOCKERS: {'; '.join(analysis['blockers']) or 'none'}
+"""
+    try:
+        combined = _extract_analysis(_call_claude(
+            reduce_prompt, max_tokens=_output_budget(estimate_tokens(analysis['summary'])), tier='fast'
+        ))
+        if combined.get('summary'):
+            analysis['summary'] = combined['summary']
+    except Exception as e:
+        print(f"⚠️  Reduce step failed, using concatenated summaries: {e}", file=sys.stderr)
+    
+    return analysis
+
+
+def invoke_bedrock_agent(transcript: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Invoke Bedrock Agent with the standup transcript.
+    
+    The agent will:
+    1. Analyze the transcript
+    2. Decide which MCP tools to call
+    3. Synthesize information
+    4. Generate beginner-friendly summary
+    
+    Transcripts longer than ``CHUNK_THRESHOLD_CHARS`` are split into chunks
+    that are summarized concurrently and then merged (map-reduce).
+    
+    Args:
+        transcript: The standup audio transcription
+        context: Additional context (user info, etc.)
+    
+    Returns:
+        Complete analysis with summary and action plan
+    """
+    
+    if len(transcript) > CHUNK_THRESHOLD_CHARS:
         try:
-            # Look for JSON in the response
-            import re
-            json_match = re.search(r'\{[\s\S]*\}', content)
-            if json_match:
-                analysis = json.loads(json_match.group())
-            else:
-                analysis = {"summary": content}
-        except:
-            analysis = {"summary": content}
+            analysis = _summarize_long_transcript(transcript)
+            return {
+                "success": True,
+                "analysis": analysis,
+                "raw_response": analysis['summary'],
+                "model_tier": "map-reduce"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    # Fit the transcript and the prebuilt team context into the input budget
+    context = context or {}
+    glossary_text = "\n".join(
+        f"- {term}: {definition}" for term, definition in context.get('glossary_subset', {}).items()
+    )
+    budget = allocate([
+        Section('transcript', transcript, priority=0),
+        Section('glossary', glossary_text, priority=1),
+        Section('tickets', context.get('ticket_context', ''), priority=2),
+        Section('architecture', context.get('architecture_doc', ''), priority=3, max_tokens=DOC_EXCERPT_MAX_TOKENS)
+    ], max(0, PROMPT_TOKEN_BUDGET - PROMPT_OVERHEAD_TOKENS))
+    sections = budget['sections']
+    
+    team_section = ""
+    if sections['tickets']:
+        team_section += f"\nTEAM TICKETS:\n{sections['tickets']}\n"
+    if sections['glossary']:
+        team_section += f"\nGLOSSARY (terms used in this standup):\n{sections['glossary']}\n"
+    if sections['architecture']:
+        team_section += f"\nARCHITECTURE (excerpt):\n{sections['architecture']}\n"
+    
+    # Build the prompt for the agent
+    prompt = f"""You are an AI onboarding assistant helping a new engineer understand their team's standup.
+
+STANDUP TRANSCRIPT:
+{sections['transcript']}
+{team_section}{ANALYSIS_INSTRUCTIONS}"""
+    
+    # Output scales with what the model has to explain, not with the tickets/doc
+    report = budget['report']
+    max_tokens = _output_budget(
+        report['sections']['transcript']['allocated'] + report['sections']['glossary']['allocated']
+    )
+    report['max_tokens'] = max_tokens
+    with _tier_stats_lock:
+        TOKEN_BUDGET_STATS['prompts'] += 1
+        TOKEN_BUDGET_STATS['truncated_prompts'] += bool(report['truncated'])
+        TOKEN_BUDGET_STATS['input_tokens_budgeted'] += report['used']
+        TOKEN_BUDGET_STATS['budget_total'] += report['budget']
+        TOKEN_BUDGET_STATS['max_tokens_requested'] += max_tokens
+
+    try:
+        # Call Bedrock with Claude on the tier that fits this transcript
+        tier = select_model_tier(transcript)
+        content = _call_claude(prompt, max_tokens=max_tokens, tier=tier)
+        analysis = _extract_analysis(content)
         
         return {
             "success": True,
             "analysis": analysis,
-            "raw_response": content
+            "raw_response": content,
+            "model_tier": tier,
+            "token_budget": report,
+            "architecture_context": sections['architecture']
         }
         
     except Exception as e:
@@ -298,12 +1138,116 @@ Be helpful, clear, and assume the new joiner is unfamiliar with the codebase.
         }
 
 
+@mcp.tool()
+async def clean_transcript(transcript: str) -> Dict[str, Any]:
+    """
+    Clean a raw transcript without analyzing it.
+    
+    Removes filler words, stutters and timestamps, normalizes spoken ticket
+    IDs and merges speaker turns - the same preprocessing that
+    process_standup_audio applies before calling Bedrock.
+    
+    Args:
+        transcript: Raw transcript text
+    """
+    prefixes = (await asyncio.to_thread(team_context.get))['ticket_prefixes']
+    cleaned, stats = await run_cpu_bound_async(preprocess_transcript, transcript, prefixes, size=len(transcript))
+    return {"success": True, "transcript": cleaned, **stats}
+
+
+# ============================================================================
+# TEAM CONTEXT BUNDLE - transcript-independent context, prebuilt in background
+# ============================================================================
+
+CONTEXT_DOC = os.getenv('CONTEXT_DOC', 'architecture_overview.md')
+
+
+def _build_team_context() -> Dict[str, Any]:
+    """Gather tickets, docs and glossary into one precomputed bundle."""
+    tickets = get_tickets()
+    if not tickets['success']:
+        raise RuntimeError(f"tickets unavailable: {tickets['error']}")
+    docs = get_docs_sync(CONTEXT_DOC)
+    # The team glossary file the scheduler watches (and explain_terms indexes)
+    terms = load_reference_json('team_glossary.json')
+    glossary = {"success": True, "glossary": terms, "term_count": len(terms)}
+    
+    # Longest terms first so "API Gateway" wins over a shorter overlapping term
+    alternation = '|'.join(re.escape(t) for t in sorted(terms, key=len, reverse=True))
+    prefixes = known_ticket_prefixes(t['id'] for t in tickets['tickets'])
+    version = hashlib.sha256(json.dumps(
+        [tickets['tickets'], docs.get('content', ''), terms], sort_keys=True
+    ).encode('utf-8')).hexdigest()[:16]
+    
+    return {
+        "version": version,
+        "built_at": datetime.now().isoformat(),
+        "tickets": tickets,
+        "docs": docs,
+        "glossary": glossary,
+        "architecture_context": truncate_to_tokens(docs.get('content', ''), DOC_EXCERPT_MAX_TOKENS),
+        "ticket_context": "\n".join(
+            f"- {t['id']}: {t['title']} ({t.get('priority', 'n/a')} priority)" for t in tickets['tickets']
+        ),
+        "ticket_prefixes": prefixes,
+        "ticket_pattern": re.compile(rf"\b(?:{'|'.join(prefixes)})-\d{{1,5}}\b") if prefixes else TICKET_ID_PATTERN,
+        "terms_by_lower": {t.lower(): t for t in terms},
+        "term_pattern": re.compile(rf'\b(?:{alternation})\b', re.IGNORECASE) if terms else None
+    }
+
+
+team_context = ContextBundleScheduler(
+    _build_team_context,
+    sources=[DATA_DIR / 'sample_jira_tickets.json', DATA_DIR / 'team_glossary.json', DATA_DIR / CONTEXT_DOC],
+    refresh_seconds=float(os.getenv('CONTEXT_REFRESH_SECONDS', '300')),
+    poll_seconds=float(os.getenv('CONTEXT_POLL_SECONDS', '5'))
+)
+
+
+def glossary_subset(transcript: str, bundle: Dict[str, Any]) -> Dict[str, str]:
+    """Glossary entries for the terms that actually occur in ``transcript``."""
+    if bundle['term_pattern'] is None:
+        return {}
+    definitions = bundle['glossary']['glossary']
+    found = {bundle['terms_by_lower'][m.lower()] for m in bundle['term_pattern'].findall(transcript)}
+    return {term: definitions[term] for term in sorted(found)}
+
+
 # ============================================================================
 # MAIN WORKFLOW - Following Your Diagram
 # ============================================================================
 
+def _analyze_transcript(transcript: str, context: Dict[str, Any], transcript_key: str,
+                        ticket_prefixes: Tuple[str, ...] = ()):
+    """Preprocess a transcript and run the Bedrock analysis on it."""
+    # Another worker may already have analyzed this exact transcript
+    cached = cache.get(f'analysis:{transcript_key}')
+    if cached is not None:
+        print("♻️  Reusing cached analysis for identical transcript", file=sys.stderr)
+        return cached[0], cached[1]
+    
+    # Step 2: Strip filler words, stutters and timestamps to shrink the prompt
+    transcript, preprocessing = run_cpu_bound(preprocess_transcript, transcript, ticket_prefixes,
+                                              size=len(transcript))
+    print(f"🧹 Preprocessed transcript: saved {preprocessing['chars_saved']} characters "
+          f"(~{preprocessing['estimated_tokens_saved']} tokens)", file=sys.stderr)
+    
+    # Step 3: Invoke Bedrock Agent for analysis
+    print("🤖 Invoking Bedrock Agent for analysis...", file=sys.stderr)
+    agent_result = invoke_bedrock_agent(transcript, context)
+    if agent_result['success']:
+        cache.set(f'analysis:{transcript_key}', [preprocessing, agent_result], ttl=ANALYSIS_CACHE_TTL)
+    return preprocessing, agent_result
+
+
+def _ticket_details(ticket_ids: List[str]) -> List[Dict[str, Any]]:
+    """Full ticket records for the IDs the analysis flagged as relevant."""
+    index = _lookup_index('tickets')
+    return [t for t in (index.get(str(ticket_id)) for ticket_id in ticket_ids) if t is not None]
+
+
 @mcp.tool()
-def process_standup_audio(transcript: str, user_id: str = "new_joiner") -> Dict[str, Any]:
+async def process_standup_audio(transcript: str, user_id: str = "new_joiner") -> Dict[str, Any]:
     """
     Complete workflow: Process standup audio transcript through AI agent.
     
@@ -322,50 +1266,65 @@ def process_standup_audio(transcript: str, user_id: str = "new_joiner") -> Dict[
         Complete analysis and action plan
     """
     
-    print(f"📝 Processing standup for user: {user_id}")
-    print(f"📄 Transcript length: {len(transcript)} characters")
+    print(f"📝 Processing standup for user: {user_id}", file=sys.stderr)
+    print(f"📄 Transcript length: {len(transcript)} characters", file=sys.stderr)
     
-    # Step 1: Get context using MCP tools
-    print("🔧 Gathering context with MCP tools...")
-    tickets = get_tickets()
-    docs = get_docs("architecture_overview.md")
-    glossary = get_glossary()
-    compliance = get_compliance_requirements()
+    # Step 1: Team context is prebuilt in the background; only the
+    # transcript-specific parts are computed here
+    bundle = await asyncio.to_thread(team_context.get)
+    compliance = await asyncio.to_thread(get_pending_compliance, user_id)
+    print(f"🔧 Using team context bundle {bundle['version']}", file=sys.stderr)
     
-    # Step 2: Invoke Bedrock Agent for analysis
-    print("🤖 Invoking Bedrock Agent for analysis...")
-    agent_result = invoke_bedrock_agent(transcript, {
-        "user_id": user_id,
-        "tickets_available": tickets.get('count', 0),
-        "docs_loaded": docs.get('success', False),
-        "glossary_terms": glossary.get('term_count', 0)
-    })
+    # Steps 2-3: Preprocess and analyze in a worker thread
+    preprocessing, agent_result = await _analyze_standup(user_id, transcript, bundle)
     
     if not agent_result['success']:
         return agent_result
     
+    return await asyncio.to_thread(_finalize_standup, user_id, bundle, compliance, agent_result, preprocessing)
+
+
+async def _analyze_standup(user_id: str, transcript: str, bundle: Dict[str, Any]):
+    """
+    One-pass analysis of a whole transcript with the team context bundle.
+    
+    Clients that submit the same transcript at the same time share a
+    single Bedrock analysis.
+    """
+    transcript_key = hashlib.sha256(
+        f"{bundle['version']}:{transcript}".encode('utf-8')
+    ).hexdigest()
+    return await _analysis_flight.do_async(transcript_key, _analyze_transcript, transcript, {
+        "user_id": user_id,
+        "tickets_available": bundle['tickets'].get('count', 0),
+        "docs_loaded": bundle['docs'].get('success', False),
+        "glossary_terms": bundle['glossary'].get('term_count', 0),
+        "ticket_context": bundle['ticket_context'],
+        "architecture_doc": bundle['architecture_context'],
+        "glossary_subset": glossary_subset(transcript, bundle)
+    }, transcript_key, bundle['ticket_prefixes'])
+
+
+def _finalize_standup(user_id: str, bundle: Dict[str, Any], compliance: Dict[str, Any],
+                      agent_result: Dict[str, Any], preprocessing: Dict[str, Any]) -> Dict[str, Any]:
+    """Steps 4-5 of a standup: enrich the analysis with tool data and save it."""
     analysis = agent_result['analysis']
     
-    # Step 3: Enhance with tool data
-    print("✨ Enhancing analysis with tool data...")
+    # Step 4: Enhance with tool data
+    print("✨ Enhancing analysis with tool data...", file=sys.stderr)
     enhanced_summary = {
         "standup_summary": analysis.get('summary', ''),
         "relevant_tickets": analysis.get('relevant_tickets', []),
-        "ticket_details": [
-            t for t in tickets.get('tickets', [])
-            if t['id'] in analysis.get('relevant_tickets', [])
-        ],
+        "ticket_details": _ticket_details(analysis.get('relevant_tickets', [])),
         "term_explanations": analysis.get('term_explanations', {}),
         "focus_areas": analysis.get('focus_areas', []),
         "blockers": analysis.get('blockers', []),
-        "architecture_context": docs.get('content', '')[:500] + "...",
-        "compliance_items": [
-            r for r in compliance.get('requirements', [])[:3]
-        ]
+        "architecture_context": agent_result.get('architecture_context', bundle['architecture_context']),
+        "compliance_items": compliance.get('pending', [])[:3]
     }
     
-    # Step 4: Save summary
-    print("💾 Saving summary...")
+    # Step 5: Save summary
+    print("💾 Saving summary...", file=sys.stderr)
     save_result = write_summary(enhanced_summary, user_id)
     
     return {
@@ -373,24 +1332,315 @@ def process_standup_audio(transcript: str, user_id: str = "new_joiner") -> Dict[
         "summary": enhanced_summary,
         "saved": save_result.get('success', False),
         "summary_id": save_result.get('summary_id'),
-        "tools_used": ["get_tickets", "get_docs", "get_glossary", "get_compliance_requirements", "write_summary"]
+        "preprocessing": preprocessing,
+        "model_tier": agent_result.get('model_tier'),
+        "context_version": bundle['version'],
+        "token_budget": agent_result.get('token_budget'),
+        "tools_used": ["get_tickets", "get_docs", "get_glossary", "get_pending_compliance", "write_summary"]
+    }
+
+
+# ============================================================================
+# LIVE STANDUPS - incremental analysis while the meeting is still running
+# ============================================================================
+
+LIVE_DELTA_MIN_CHARS = int(os.getenv('LIVE_DELTA_MIN_CHARS', '1200'))
+LIVE_DELTA_MAX_CHARS = int(os.getenv('LIVE_DELTA_MAX_CHARS', '4000'))
+LIVE_SESSION_TTL_SECONDS = float(os.getenv('LIVE_SESSION_TTL_SECONDS', '7200'))
+LIVE_FINISH_TIMEOUT_SECONDS = float(os.getenv('LIVE_FINISH_TIMEOUT_SECONDS', '120'))
+
+_live_sessions: Dict[str, LiveStandupSession] = {}
+_live_sessions_lock = threading.Lock()
+_live_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('LIVE_ANALYSIS_WORKERS', '4')), thread_name_prefix='live-standup'
+)
+
+
+def _live_session(session_id: str) -> LiveStandupSession:
+    with _live_sessions_lock:
+        session = _live_sessions.get(session_id)
+    if session is None:
+        raise KeyError(f"Unknown or expired live session: {session_id}")
+    return session
+
+
+@mcp.tool()
+def start_live_standup(user_id: str = "new_joiner") -> Dict[str, Any]:
+    """
+    Start a live standup session that accepts transcript segments as they arrive.
+    
+    Args:
+        user_id: Identifier for the new joiner
+    
+    Returns the session_id to pass to add_transcript_segment and
+    finish_live_standup.
+    """
+    try:
+        bundle = team_context.get()
+        session = LiveStandupSession(
+            user_id,
+            ticket_pattern=bundle['ticket_pattern'],
+            term_pattern=bundle['term_pattern'],
+            ticket_prefixes=bundle['ticket_prefixes'],
+            analyze_delta=_summarize_chunk,
+            executor=_live_executor,
+            min_delta_chars=LIVE_DELTA_MIN_CHARS,
+            max_delta_chars=LIVE_DELTA_MAX_CHARS
+        )
+        
+        now = time.monotonic()
+        with _live_sessions_lock:
+            # Drop sessions whose clients disappeared without finishing
+            for stale_id in [sid for sid, s in _live_sessions.items()
+                             if now - s.last_active > LIVE_SESSION_TTL_SECONDS]:
+                del _live_sessions[stale_id]
+            _live_sessions[session.session_id] = session
+        
+        return {"success": True, "session_id": session.session_id, "user_id": user_id}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+@mcp.tool()
+def add_transcript_segment(session_id: str, segment: str) -> Dict[str, Any]:
+    """
+    Add a transcript segment to a live standup.
+    
+    Args:
+        session_id: ID returned by start_live_standup
+        segment: Newly transcribed text
+    
+    Returns the tickets, glossary terms and blockers detected so far and
+    whether a background model analysis was scheduled for this delta.
+    """
+    try:
+        return {"success": True, **_live_session(session_id).add_segment(segment)}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+@mcp.tool()
+async def finish_live_standup(session_id: str) -> Dict[str, Any]:
+    """
+    End a live standup: analyze the last delta, merge all partial analyses
+    and save the summary.
+    
+    Args:
+        session_id: ID returned by start_live_standup
+    
+    Returns the same result shape as process_standup_audio.
+    """
+    try:
+        session = _live_session(session_id)
+        futures = session.close()
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+    finally:
+        with _live_sessions_lock:
+            _live_sessions.pop(session_id, None)
+    
+    # One deadline for all delta analyses; the event loop keeps serving
+    # other clients while they finish
+    partials = []
+    if futures:
+        waiting = [asyncio.wrap_future(f) for f in futures]
+        done, _ = await asyncio.wait(waiting, timeout=LIVE_FINISH_TIMEOUT_SECONDS)
+        for future, wrapped in zip(futures, waiting):
+            if wrapped not in done:
+                future.cancel()
+            elif wrapped.exception() is None:
+                partials.append(wrapped.result())
+    
+    transcript = session.transcript
+    if not transcript:
+        return {"success": False, "error": "No transcript segments were received"}
+    
+    bundle = await asyncio.to_thread(team_context.get)
+    stats = session.stats
+    if partials:
+        analysis = await asyncio.get_running_loop().run_in_executor(_bedrock_executor, _reduce_partials, partials)
+        model_tier = "live"
+    else:
+        # Every delta failed or ran out of time: analyze the meeting in one pass
+        print(f"⚠️  No delta analyses for live session {session_id}, analyzing the full transcript",
+              file=sys.stderr)
+        _, agent_result = await _analyze_standup(session.user_id, transcript, bundle)
+        if not agent_result['success']:
+            return agent_result
+        analysis = {"relevant_tickets": [], "term_explanations": {}, "blockers": [],
+                    **agent_result['analysis']}
+        model_tier = agent_result.get('model_tier')
+    
+    # Local matches the model may have skipped still make it into the summary
+    analysis['relevant_tickets'] = _dedupe(analysis['relevant_tickets'] + session.tickets)
+    definitions = glossary_subset(" ".join(session.terms), bundle)
+    analysis['term_explanations'] = {**definitions, **analysis['term_explanations']}
+    analysis['blockers'] = analysis['blockers'] or session.blockers
+    
+    preprocessing = {
+        "original_chars": stats['original_chars'],
+        "processed_chars": stats['processed_chars'],
+        "chars_saved": stats['original_chars'] - stats['processed_chars'],
+        "estimated_tokens_saved": (stats['original_chars'] - stats['processed_chars']) // 4
     }
+    compliance = await asyncio.to_thread(get_pending_compliance, session.user_id)
+    result = await asyncio.to_thread(_finalize_standup, session.user_id, bundle, compliance, {
+        "analysis": analysis,
+        "model_tier": model_tier,
+        "architecture_context": bundle['architecture_context']
+    }, preprocessing)
+    result['live'] = {"segments": stats['segments'], "delta_analyses": stats['delta_analyses'],
+                      "delta_analyses_used": len(partials)}
+    return result
+
+
+# ============================================================================
+# ADMIN PROFILING - registered only with PROFILER_ENABLED=1 and an admin token
+# ============================================================================
+
+PROFILER_ENABLED = os.getenv('PROFILER_ENABLED', '').lower() in ('1', 'true', 'yes')
+PROFILER_ADMIN_TOKEN = os.getenv('PROFILER_ADMIN_TOKEN', '')
+PROFILER_MAX_SECONDS = float(os.getenv('PROFILER_MAX_SECONDS', '120'))
+PROFILE_DIR = Path(os.getenv('PROFILE_DIR', '/tmp/onboarding-copilot-profiles'))
+PROFILE_MAX_STACK_LINES = int(os.getenv('PROFILE_MAX_STACK_LINES', '500'))
+_PROFILER_TOOLS = ('start_profile', 'get_profile')
+_profiler = None
+
+
+def _require_admin(admin_token: str):
+    if not hmac.compare_digest(admin_token.encode('utf-8'), PROFILER_ADMIN_TOKEN.encode('utf-8')):
+        raise PermissionError("Invalid admin token")
+
+
+def start_profile(admin_token: str, duration_seconds: float = 10.0, tool_calls: int = 0,
+                  interval_ms: float = 5.0) -> Dict[str, Any]:
+    """
+    Admin: start sampling the server's Python stacks.
+    
+    Profiles either a time window or, with tool_calls > 0, the next N tool
+    calls (sampling only while one of them is running). Fetch the result
+    with get_profile.
+    
+    Args:
+        admin_token: Value of PROFILER_ADMIN_TOKEN
+        duration_seconds: Length of the time window (ignored with tool_calls)
+        tool_calls: Profile the next N tool calls instead of a time window
+        interval_ms: Sampling interval
+    """
+    try:
+        _require_admin(admin_token)
+        profile = _profiler.start(
+            interval=max(interval_ms, 1.0) / 1000,
+            duration=None if tool_calls > 0 else duration_seconds,
+            tool_calls=tool_calls if tool_calls > 0 else None,
+            max_seconds=PROFILER_MAX_SECONDS
+        )
+        if tool_calls > 0:
+            _profiler.watch_calls(mcp._tool_manager, 'call_tool', profile, ignore=_PROFILER_TOOLS)
+        print(f"🔬 Profile {profile.profile_id} started", file=sys.stderr)
+        return {"success": True, **profile.summary()}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+def get_profile(admin_token: str, profile_id: str, include_stacks: bool = True) -> Dict[str, Any]:
+    """
+    Admin: status and results of a profile started with start_profile.
+    
+    Args:
+        admin_token: Value of PROFILER_ADMIN_TOKEN
+        profile_id: ID returned by start_profile
+        include_stacks: Include the collapsed stacks (flamegraph input)
+    
+    Returns the hottest functions and, once finished, the path of the
+    ``.folded`` artifact for flamegraph.pl / speedscope.
+    """
+    try:
+        _require_admin(admin_token)
+        profile = _profiler.get(profile_id)
+        result = {"success": True, **profile.summary(), "top_functions": profile.top_functions()}
+        if not profile.running:
+            result['artifact'] = str(_profiler.write_artifact(profile))
+        if include_stacks:
+            lines = profile.collapsed().splitlines()
+            result['collapsed_stacks'] = "\n".join(lines[:PROFILE_MAX_STACK_LINES])
+            result['stacks_truncated'] = len(lines) > PROFILE_MAX_STACK_LINES
+        return result
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+if PROFILER_ENABLED:
+    if PROFILER_ADMIN_TOKEN:
+        from sampling_profiler import ProfilerController
+        
+        _profiler = ProfilerController(PROFILE_DIR)
+        mcp.tool()(start_profile)
+        mcp.tool()(get_profile)
+    else:
+        print("⚠️  PROFILER_ENABLED is set but PROFILER_ADMIN_TOKEN is empty; profiler tools not registered",
+              file=sys.stderr)
 
 
 # ============================================================================
 # SERVER STARTUP
 # ============================================================================
 
+def create_http_app():
+    """
+    ASGI app for one HTTP worker process.
+    
+    Workers share nothing in memory, so the transport runs stateless with
+    plain JSON responses - any worker can serve any request.
+    """
+    mcp.settings.stateless_http = True
+    mcp.settings.json_response = True
+    team_context.start()
+    return mcp.streamable_http_app()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Onboarding Copilot MCP server")
+    parser.add_argument('--transport', choices=['stdio', 'sse', 'streamable-http'],
+                        default=os.getenv('MCP_TRANSPORT', 'stdio'))
+    parser.add_argument('--host', default=os.getenv('MCP_HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.getenv('MCP_PORT', '8000')))
+    parser.add_argument('--workers', type=int, default=int(os.getenv('MCP_WORKERS', '1')),
+                        help="Pre-forked worker processes (streamable-http only)")
+    args = parser.parse_args()
+    
+    if args.workers > 1 and args.transport != 'streamable-http':
+        parser.error("--workers needs --transport streamable-http (stdio and SSE sessions live in one process)")
+    
+    # stdout carries the protocol in stdio mode, so the banner goes to stderr
+    print("🚀 Starting MCP Server with Bedrock Agent Integration...", file=sys.stderr)
+    print(f"📡 {len(mcp._tool_manager.list_tools())} MCP tools, transport={args.transport}, "
+          f"workers={args.workers}", file=sys.stderr)
+    
+    # Build the team context before the first standup arrives. A stdio
+    # server is spawned per client session, so its first build waits until
+    # initialize/list_tools have been answered. HTTP workers start their own
+    # scheduler in create_http_app(): uvicorn imports this module again, so
+    # starting it here would only add an idle copy in the supervisor.
+    if args.transport == 'stdio':
+        team_context.start(delay=float(os.getenv('CONTEXT_WARMUP_DELAY_SECONDS', '2')))
+        mcp.run()
+    elif args.transport == 'sse':
+        team_context.start()
+        mcp.settings.host = args.host
+        mcp.settings.port = args.port
+        mcp.run(transport='sse')
+    else:
+        import uvicorn
+        
+        # Workers are separate processes: share cached results through SQLite
+        # unless another shared backend was configured
+        if args.workers > 1:
+            os.environ.setdefault('CACHE_BACKEND', 'sqlite')
+        print(f"✅ Serving http://{args.host}:{args.port}/mcp", file=sys.stderr)
+        uvicorn.run('server:create_http_app', factory=True, host=args.host,
+                    port=args.port, workers=args.workers, log_level='warning')
+
+
 if __name__ == "__main__":
-    print("🚀 Starting MCP Server with Bedrock Agent Integration...")
-    print("📡 Available MCP Tools:")
-    print("   - get_tickets()")
-    print("   - get_docs(doc_name)")
-    print("   - get_glossary()")
-    print("   - get_compliance_requirements()")
-    print("   - write_summary(summary, user_id)")
-    print("   - process_standup_audio(transcript, user_id)")
-    print("\n✅ MCP Server ready!")
-    
-    # Run the MCP server
-    mcp.run()
+    main()
@@ -0,0 +1,144 @@
+"""
+Shared Cache
+Result cache that works across MCP server worker processes.
+
+Backends (CACHE_BACKEND):
+- memory: in-process dict. This is the default for a single stdio
+  process.
+- sqlite: one SQLite file in WAL mode on local disk. It is a stand-in for
+  Redis that needs no extra service, and every worker on the host reads
+  and writes the same file.
+- redis: a real Redis at REDIS_URL. It needs the optional ``redis``
+  package.
+
+Values must be JSON serializable. Entries expire after their TTL.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_TTL_SECONDS = float(os.getenv('CACHE_TTL_SECONDS', '300'))
+
+
+class MemoryCache:
+    """Per-process cache (no sharing between workers)."""
+
+    backend = 'memory'
+
+    def __init__(self):
+        self._data: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "sets": 0}
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.time():
+                self._data.pop(key, None)
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits'] += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: float = DEFAULT_TTL_SECONDS):
+        with self._lock:
+            self._data[key] = (time.time() + ttl, value)
+            self.stats['sets'] += 1
+
+
+class SqliteCache:
+    """Host-wide cache shared by all worker processes through one SQLite file."""
+
+    backend = 'sqlite'
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self.stats = {"hits": 0, "misses": 0, "sets": 0}
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, expires REAL)"
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite connections can't be shared across threads or forked processes
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self._conn().execute(
+            "SELECT value FROM cache WHERE key = ? AND expires > ?", (key, time.time())
+        ).fetchone()
+        if row is None:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float = DEFAULT_TTL_SECONDS):
+        conn = self._conn()
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+            (key, json.dumps(value), now + ttl)
+        )
+        self.stats['sets'] += 1
+        # Opportunistic cleanup keeps the file from growing without bound
+        if self.stats['sets'] % 100 == 0:
+            conn.execute("DELETE FROM cache WHERE expires <= ?", (now,))
+
+
+class RedisCache:
+    """Cache backed by a Redis server (optional ``redis`` dependency)."""
+
+    backend = 'redis'
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError("CACHE_BACKEND=redis requires the 'redis' package") from e
+        self._redis = redis.Redis.from_url(url)
+        self.stats = {"hits": 0, "misses": 0, "sets": 0}
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self._redis.get(key)
+        if raw is None:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        return json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: float = DEFAULT_TTL_SECONDS):
+        self._redis.set(key, json.dumps(value), px=int(ttl * 1000))
+        self.stats['sets'] += 1
+
+
+def create_cache(backend: str = None, sqlite_path: Path = None):
+    """
+    Build the cache selected by ``backend`` (or the CACHE_BACKEND env var).
+
+    Args:
+        backend: 'memory', 'sqlite' or 'redis'
+        sqlite_path: Database file for the sqlite backend
+    """
+    backend = (backend or os.getenv('CACHE_BACKEND', 'memory')).lower()
+    if backend == 'memory':
+        return MemoryCache()
+    if backend == 'sqlite':
+        return SqliteCache(sqlite_path or Path(os.getenv('CACHE_SQLITE_PATH', '/tmp/onboarding-copilot-cache.db')))
+    if backend == 'redis':
+        return RedisCache(os.getenv('REDIS_URL', 'redis://localhost:6379/0'))
+    raise ValueError(f"Unknown CACHE_BACKEND: {backend}")
@@ -0,0 +1,106 @@
+"""
+Single-Flight Request Coalescing
+Concurrent callers asking for the same key share one in-flight call.
+
+When a standup ends, many clients call the same tools with the same
+arguments at once. Instead of each of them hitting S3 / Bedrock, the first
+caller (the leader) does the work and everyone else waits on its future.
+Results are shared between callers, so treat them as read-only.
+
+FastMCP runs sync tools inline on the event loop, one at a time, so only
+async tools ever have same-key callers in flight together. They use
+``do_async()``: the leader's work runs in a worker thread and waiters just
+await its future without holding a thread. A group given its own executor
+runs its work there, so slow calls (Bedrock) can't fill the event loop's
+default executor that short blocking calls share.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls that share a key."""
+
+    def __init__(self, name: str, executor: Optional[Executor] = None):
+        self.name = name
+        self.executor = executor
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {"executions": 0, "coalesced": 0}
+
+    def _claim(self, key: Hashable):
+        """The in-flight future for ``key`` and whether the caller leads it."""
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self._stats['coalesced'] += 1
+                return future, False
+            future = Future()
+            # Running futures can't be cancelled, so a waiter that gives up
+            # (e.g. a cancelled asyncio task) can't break it for the others
+            future.set_running_or_notify_cancel()
+            self._in_flight[key] = future
+            self._stats['executions'] += 1
+            return future, True
+
+    def _lead(self, key: Hashable, future: Future, fn: Callable[..., Any], args, kwargs) -> Any:
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run ``fn(*args, **kwargs)`` unless a call for ``key`` is already running,
+        in which case wait for and return that call's result (or exception).
+        """
+        future, leader = self._claim(key)
+        if not leader:
+            return future.result()
+        return self._lead(key, future, fn, args, kwargs)
+
+    async def do_async(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Async ``do()``: the leader runs the blocking ``fn`` in the group's
+        executor (the event loop's default one if none was given), every
+        caller awaits the shared result.
+        """
+        future, leader = self._claim(key)
+        if leader:
+            def run():
+                try:
+                    self._lead(key, future, fn, args, kwargs)
+                except BaseException:
+                    pass  # delivered to every caller through ``future``
+
+            asyncio.get_running_loop().run_in_executor(self.executor, run)
+        return await asyncio.wrap_future(future)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "in_flight": len(self._in_flight)}
+
+
+_groups: Dict[str, SingleFlight] = {}
+
+
+def single_flight(name: str, executor: Optional[Executor] = None) -> SingleFlight:
+    """Create (or return) the named coalescing group; ``executor`` runs its async leaders."""
+    if name not in _groups:
+        _groups[name] = SingleFlight(name, executor)
+    return _groups[name]
+
+
+def singleflight_metrics() -> Dict[str, Any]:
+    """Executions and coalesced waiters for every group."""
+    return {name: group.metrics() for name, group in _groups.items()}
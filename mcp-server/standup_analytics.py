@@ -0,0 +1,225 @@
+"""
+Standup Analytics
+Rollups over saved standup summaries: tickets, glossary terms, blockers and
+users counted per day.
+
+Rollups are kept incrementally. Every newly written summary appends one
+line to an append-only event log and bumps the in-memory daily counters.
+Processes replay the log to build their counters, and later pick up lines
+appended by other worker processes. Replaying is cheap: one short JSON
+line per summary instead of one file per summary.
+Window queries ("last 14 days") only sum the daily counters they cover.
+
+``recompute()`` rebuilds everything from the summary archive (the JSON
+files write_summary leaves on disk). It uses pandas, vectorized, when
+available and plain Python otherwise, and can also export the flattened
+rows as Parquet (pandas + pyarrow) for offline analysis.
+"""
+
+import json
+import re
+import threading
+from collections import Counter
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+DIMENSIONS = ('tickets', 'terms', 'blockers', 'users')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_blocker(text: str) -> str:
+    """Group blockers that only differ in case, spacing or trailing punctuation."""
+    return _WHITESPACE.sub(' ', str(text)).strip().rstrip('.!;,').lower()[:120]
+
+
+def summary_event(summary: Dict[str, Any]) -> Dict[str, Any]:
+    """The fields of a saved summary that the rollups count."""
+    timestamp = summary.get('timestamp') or datetime.now().isoformat()
+    return {
+        "id": summary.get('id'),
+        "day": timestamp[:10],
+        "user": summary.get('user_id', 'unknown'),
+        "tickets": sorted({str(t).strip().upper() for t in summary.get('relevant_tickets') or []}),
+        "terms": sorted(set(summary.get('term_explanations') or {})),
+        "blockers": sorted({normalize_blocker(b) for b in summary.get('blockers') or [] if str(b).strip()})
+    }
+
+
+class StandupAnalytics:
+    """Daily rollups backed by an append-only event log."""
+
+    def __init__(self, events_path: Path):
+        self.events_path = Path(events_path)
+        self._daily: Dict[str, Dict[str, Counter]] = {}
+        self._seen_ids = set()
+        self._lock = threading.Lock()
+        self._log_identity = None
+        self._offset = 0
+
+    def _apply(self, event: Dict[str, Any]):
+        if event.get('id') in self._seen_ids:
+            return
+        # Read every field first so a malformed event changes nothing
+        items = {d: event[d] for d in ('tickets', 'terms', 'blockers')}
+        user, day_key = event['user'], event['day']
+        self._seen_ids.add(event.get('id'))
+        day = self._daily.setdefault(day_key, {d: Counter() for d in DIMENSIONS})
+        for dimension, keys in items.items():
+            day[dimension].update(keys)
+        day['users'][user] += 1
+
+    def _catch_up(self):
+        """Apply log lines appended since the last read (by this or another worker process)."""
+        try:
+            st = self.events_path.stat()
+        except FileNotFoundError:
+            return
+        identity = (st.st_dev, st.st_ino)
+        if identity != self._log_identity or st.st_size < self._offset:
+            # First read, or the log was replaced by a recompute elsewhere:
+            # replay it from the start
+            self._daily, self._seen_ids, self._log_identity, self._offset = {}, set(), identity, 0
+        if st.st_size == self._offset:
+            return
+        with open(self.events_path, 'rb') as f:
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # another process is still writing this line
+                self._offset += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    self._apply(json.loads(line))
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    continue  # corrupt line: skip it, keep the rest of the log
+
+    def record(self, summary: Dict[str, Any]):
+        """Count one newly saved summary (ignored if its id was already counted)."""
+        event = summary_event(summary)
+        with self._lock:
+            self._catch_up()
+            if event['id'] in self._seen_ids:
+                return
+            self.events_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.events_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(event, separators=(',', ':')) + "\n")
+            self._apply(event)
+
+    def insights(self, days: int = 14, top_n: int = 10, today: Optional[date] = None) -> Dict[str, Any]:
+        """Top tickets, terms, blockers and users over the last ``days`` days."""
+        today = today or date.today()
+        window = [(today - timedelta(days=i)).isoformat() for i in range(days)]
+        totals = {d: Counter() for d in DIMENSIONS}
+        per_day = {}
+        with self._lock:
+            self._catch_up()
+            for day in window:
+                counters = self._daily.get(day)
+                if counters is None:
+                    continue
+                per_day[day] = sum(counters['users'].values())
+                for dimension in DIMENSIONS:
+                    totals[dimension].update(counters[dimension])
+
+        return {
+            "window": {"from": window[-1], "to": window[0], "days": days},
+            "standups": sum(per_day.values()),
+            "standups_per_day": dict(sorted(per_day.items())),
+            **{
+                f"top_{dimension}": [{"key": k, "count": c} for k, c in totals[dimension].most_common(top_n)]
+                for dimension in DIMENSIONS
+            }
+        }
+
+    def recompute(self, summary_dir: Path, parquet_path: Optional[Path] = None) -> Dict[str, Any]:
+        """
+        Rebuild the event log and rollups from the summary archive.
+
+        Args:
+            summary_dir: Directory holding write_summary's summary_*.json files
+            parquet_path: Also export the flattened rows here (pandas + pyarrow)
+        """
+        events = sorted(load_archive(summary_dir), key=lambda e: (e['day'], e.get('id') or ''))
+        columns = flatten(events)
+        counts, engine = rollup_counts(columns)
+
+        daily: Dict[str, Dict[str, Counter]] = {}
+        for (day, dimension, key), count in counts.items():
+            daily.setdefault(day, {d: Counter() for d in DIMENSIONS})[dimension][key] = count
+
+        self.events_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.events_path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for event in events:
+                f.write(json.dumps(event, separators=(',', ':')) + "\n")
+        with self._lock:
+            tmp.replace(self.events_path)
+            self._daily = daily
+            self._seen_ids = {event.get('id') for event in events}
+            st = self.events_path.stat()
+            self._log_identity, self._offset = (st.st_dev, st.st_ino), st.st_size
+
+        return {
+            "summaries": len(events),
+            "rows": len(columns['key']),
+            "days": len(daily),
+            "engine": engine,
+            "parquet": str(export_parquet(columns, parquet_path)) if parquet_path else None
+        }
+
+
+def load_archive(summary_dir: Path, pattern: str = 'summary_*.json') -> List[Dict[str, Any]]:
+    """Events for every summary file in ``summary_dir`` (unreadable files are skipped)."""
+    events = []
+    for path in sorted(Path(summary_dir).glob(pattern)):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                events.append(summary_event(json.load(f)))
+        except (OSError, ValueError):
+            continue
+    return events
+
+
+def flatten(events: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Columnar (day, user, dimension, key) rows, one per counted item."""
+    columns = {"day": [], "user": [], "dimension": [], "key": []}
+    for event in events:
+        items = [('users', event['user'])]
+        items += [(dimension, key) for dimension in ('tickets', 'terms', 'blockers') for key in event[dimension]]
+        for dimension, key in items:
+            columns['day'].append(event['day'])
+            columns['user'].append(event['user'])
+            columns['dimension'].append(dimension)
+            columns['key'].append(key)
+    return columns
+
+
+def rollup_counts(columns: Dict[str, List[str]]) -> Tuple[Dict[tuple, int], str]:
+    """
+    Counts per (day, dimension, key) and the engine used: a pandas groupby
+    when pandas is installed, a Counter otherwise.
+    """
+    try:
+        import pandas as pd
+    except ImportError:
+        return dict(Counter(zip(columns['day'], columns['dimension'], columns['key']))), 'python'
+
+    frame = pd.DataFrame(columns)
+    if frame.empty:
+        return {}, 'pandas'
+    counts = frame.groupby(['day', 'dimension', 'key'], sort=False).size()
+    return {index: int(count) for index, count in counts.items()}, 'pandas'
+
+
+def export_parquet(columns: Dict[str, List[str]], path: Path) -> Path:
+    """Write the flattened rows as Parquet (requires pandas and pyarrow)."""
+    try:
+        import pandas as pd
+    except ImportError as e:
+        raise ImportError("Parquet export requires the 'pandas' and 'pyarrow' packages") from e
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(columns).to_parquet(path, index=False)
+    return path
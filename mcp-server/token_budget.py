@@ -0,0 +1,129 @@
+"""
+Token Budget Manager
+Fits prompt sections into a token budget by priority and sizes max_tokens.
+
+Prompts used to be assembled with fixed character cuts:
+- the architecture doc was cut to 500 chars
+- every call asked for max_tokens=4000
+
+So small standups over-reserved output and large context got cut blindly.
+Instead, each section is now measured with a fast local token estimate and
+the input budget is handed out in priority order. Sections that don't fit
+are trimmed on line/sentence boundaries, and max_tokens is derived from the
+expected output size.
+
+The estimate is deliberately conservative: it is a heuristic, not the
+model's tokenizer, so the budget should be set with some headroom.
+"""
+
+import math
+import re
+from typing import Any, Dict, List, NamedTuple
+
+# Word runs, numbers and individual punctuation marks are each roughly one
+# BPE token; long words split into several.
+_TOKEN_PIECE = re.compile(r"[^\W\d_]+|\d+|[^\w\s]")
+_CHARS_PER_WORD_TOKEN = 6
+_BREAKS = re.compile(r'\n\s*\n|\n|(?<=[.!?])\s+')
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast local estimate of the token count of ``text``."""
+    if not text:
+        return 0
+    tokens = 0
+    for piece in _TOKEN_PIECE.findall(text):
+        if len(piece) <= _CHARS_PER_WORD_TOKEN:
+            tokens += 1
+        else:
+            tokens += math.ceil(len(piece) / _CHARS_PER_WORD_TOKEN)
+    return tokens
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Longest prefix of ``text`` that fits in ``max_tokens``.
+
+    Cuts at the last paragraph, line or sentence break that fits, and falls
+    back to a hard cut only when not even the first sentence fits.
+    """
+    if max_tokens <= 0:
+        return ''
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    # Breaks fall on whitespace, so per-segment estimates add up exactly
+    cut = used = 0
+    for match in _BREAKS.finditer(text):
+        used += estimate_tokens(text[cut:match.start()])
+        if used > max_tokens:
+            break
+        cut = match.start()
+    if cut:
+        return text[:cut].rstrip()
+
+    # Binary search for a hard cut inside the first sentence
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if estimate_tokens(text[:mid]) <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo].rstrip()
+
+
+class Section(NamedTuple):
+    name: str
+    text: str
+    priority: int          # lower is more important
+    max_tokens: int = 0    # per-section cap (0 = no cap)
+
+
+def allocate(sections: List[Section], budget: int) -> Dict[str, Any]:
+    """
+    Fit ``sections`` into ``budget`` input tokens, most important first.
+
+    Returns:
+        {"sections": {name: fitted text}, "report": {...}} where the report
+        lists requested / allocated tokens per section, what was truncated
+        and the overall utilization of the budget.
+    """
+    remaining = budget
+    fitted = {}
+    details = {}
+    for section in sorted(sections, key=lambda s: s.priority):
+        requested = estimate_tokens(section.text)
+        allowance = min(remaining, section.max_tokens) if section.max_tokens else remaining
+        text = section.text if requested <= allowance else truncate_to_tokens(section.text, allowance)
+        used = requested if text is section.text else estimate_tokens(text)
+        remaining -= used
+        fitted[section.name] = text
+        details[section.name] = {
+            "requested": requested,
+            "allocated": used,
+            "truncated": text is not section.text
+        }
+
+    used_total = budget - remaining
+    return {
+        "sections": fitted,
+        "report": {
+            "budget": budget,
+            "used": used_total,
+            "utilization": round(used_total / budget, 3) if budget else 0.0,
+            "truncated": [name for name, d in details.items() if d['truncated']],
+            "sections": details
+        }
+    }
+
+
+def output_tokens_for(input_tokens: int, ratio: float = 0.35, floor: int = 512,
+                      ceiling: int = 4000) -> int:
+    """
+    max_tokens for a summarization call.
+
+    Summaries grow with the input but much more slowly, so the reservation is
+    a fraction of the input clamped to [floor, ceiling].
+    """
+    return max(floor, min(ceiling, int(input_tokens * ratio)))